@@ -0,0 +1,6 @@
+import os
+
+os.environ.setdefault("ASYNC_DATABASE_URL", "sqlite+aiosqlite:///./bench.sqlite3")
+os.environ.setdefault("SYNC_DATABASE_URL", "sqlite:///./bench.sqlite3")
+os.environ.setdefault("DATABASE_ECHO", "False")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
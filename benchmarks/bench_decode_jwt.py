@@ -0,0 +1,28 @@
+import timeit
+
+from src.models.accounts import User
+from src.service import accounts
+from src.service.accounts import UserService
+
+NUMBER = 20000
+
+
+def bench(label: str, token: str) -> float:
+    user_service = UserService()
+    seconds = timeit.timeit(lambda: user_service.decode_claims(access_token=token), number=NUMBER)
+    print(f"{label:>10}: {NUMBER / seconds:>12,.0f} decodes/s  {seconds / NUMBER * 1e6:8.2f} us/decode")
+    return seconds
+
+
+if __name__ == "__main__":
+    token = UserService().create_jwt(user=User(id=1, email="bench@test.com", membership_id=1))
+
+    maxsize = accounts.token_cache.maxsize
+    accounts.token_cache.maxsize = 0
+    accounts.token_cache.clear()
+    uncached = bench("uncached", token)
+
+    accounts.token_cache.maxsize = maxsize
+    cached = bench("cached", token)
+
+    print(f"{'speedup':>10}: {uncached / cached:.1f}x")
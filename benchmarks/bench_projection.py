@@ -0,0 +1,70 @@
+import asyncio
+import time
+import tracemalloc
+
+from sqlmodel import SQLModel, delete
+
+from src import database
+from src.models.profile import Country, Enterprise, EnterpriseType, Industry
+from src.models.repository import AccountRepository
+from src.schema.response import GetEnterprisesResponse
+
+ROWS = 100_000
+
+
+async def seed() -> None:
+    async with database.async_engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+    async with database.async_session() as session:
+        for model in [Enterprise, Country, Industry, EnterpriseType]:
+            await session.execute(delete(model))
+        session.add_all([Country(id=1, name="Korea"), Industry(id=1, name="Software"), EnterpriseType(id=1, name="Startup")])
+        await AccountRepository(session=session).add_objects(
+            [
+                Enterprise(name=f"enterprise{number}", description="description", enterprise_type_id=1, industry_id=1, country_id=1)
+                for number in range(ROWS)
+            ],
+            returning=False,
+        )
+        await session.commit()
+
+
+async def entities() -> list:
+    async with database.async_session() as session:
+        enterprises = await AccountRepository(session=session).get_all_obj(Enterprise)
+
+        return [
+            GetEnterprisesResponse(id=enterprise.id, name=enterprise.name, description=enterprise.description)
+            for enterprise in enterprises
+        ]
+
+
+async def projection() -> list:
+    async with database.async_session() as session:
+        rows = await AccountRepository(session=session).get_all_projected(Enterprise, GetEnterprisesResponse)
+
+        return [GetEnterprisesResponse.model_validate(row) for row in rows]
+
+
+async def bench(label: str, loader) -> None:
+    tracemalloc.start()
+    started = time.perf_counter()
+    rows = await loader()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert len(rows) == ROWS
+    print(f"{label:>10}: {elapsed * 1000:8.0f} ms  peak {peak / 2 ** 20:7.1f} MiB")
+
+
+async def main() -> None:
+    await seed()
+    await bench("entities", entities)
+    await bench("projection", projection)
+    await database.close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,74 @@
+import asyncio
+import datetime
+import time
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from src.interfaces.serialization import encode
+from src.schema.response import GetCareerResponse, GetProfileResponse
+
+ROWS = 10_000
+ROUNDS = 5
+
+
+def career_rows() -> list[dict]:
+    start_time = datetime.datetime(2020, 1, 1)
+
+    return [
+        {
+            "id": row_id,
+            "position": "Engineer",
+            "description": "description",
+            "start_time": start_time,
+            "end_time": None,
+            "employment_type_id": 1,
+            "employment_type_name": "Fulltime",
+            "enterprise_id": row_id,
+            "enterprise_name": f"enterprise{row_id}",
+        }
+        for row_id in range(ROWS)
+    ]
+
+
+def profile_rows() -> list[dict]:
+    return [
+        {
+            "id": row_id,
+            "name": "name",
+            "occupation": "occupation",
+            "personal_description": "description",
+            "region": "region",
+            "country_name": "South Korea",
+        }
+        for row_id in range(ROWS)
+    ]
+
+
+async def fastapi_default(model, rows: list[dict]) -> bytes:
+    # what the router did before: handler builds models, FastAPI validates them again and json.dumps the result
+    field = create_response_field(name="Response", type_=list[model], mode="serialization")
+    content = await serialize_response(field=field, response_content=[model(**row) for row in rows])
+
+    return JSONResponse(content).body
+
+
+def bench(label: str, render) -> None:
+    started = time.process_time()
+    for _ in range(ROUNDS):
+        render()
+    elapsed = (time.process_time() - started) / ROUNDS
+
+    print(f"{label:>26}: {elapsed * 1000:8.1f} ms/response  {elapsed / ROWS * 1e6:6.2f} us/row")
+
+
+if __name__ == "__main__":
+    careers, profiles = career_rows(), profile_rows()
+    assert encode(profiles) == encode(profiles, GetProfileResponse)
+
+    bench("careers fastapi default", lambda: asyncio.run(fastapi_default(GetCareerResponse, careers)))
+    bench("careers validated once", lambda: encode(careers, GetCareerResponse))
+    bench("profiles fastapi default", lambda: asyncio.run(fastapi_default(GetProfileResponse, profiles)))
+    bench("profiles validated once", lambda: encode(profiles, GetProfileResponse))
+    bench("profiles trusted", lambda: encode(profiles))
@@ -0,0 +1,93 @@
+import asyncio
+import random
+import string
+import time
+
+from src import config
+from src.service.suggest import PrefixIndex, SuggestIndexes, build_arrays
+
+ENTRIES = 1_000_000
+QUERIES = 20_000
+
+
+def dataset() -> tuple[list[tuple[int, str]], dict[int, int]]:
+    rng = random.Random(0)
+    names = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 12))) for _ in range(ENTRIES)]
+    popularity = {row_id: int(rng.paretovariate(1.2)) for row_id in range(ENTRIES)}
+
+    return list(enumerate(names)), popularity
+
+
+def build(rows: list[tuple[int, str]], popularity: dict[int, int]) -> PrefixIndex:
+    index = PrefixIndex("bench")
+    started = time.perf_counter()
+    index.build(rows, dict(popularity))
+    print(f"build {ENTRIES:,} entries: {time.perf_counter() - started:.2f} s")
+
+    return index
+
+
+def report(label: str, index: PrefixIndex, queries: list[str]) -> None:
+    latencies = []
+    for query in queries:
+        started = time.perf_counter()
+        index.suggest(query, 10)
+        latencies.append(time.perf_counter() - started)
+
+    latencies.sort()
+    print(label + ": " + ", ".join(
+        f"{name} {latencies[min(int(quantile * len(latencies)), len(latencies) - 1)] * 1000:.3f} ms"
+        for name, quantile in [("p50", 0.5), ("p99", 0.99), ("max", 1.0)]
+    ))
+
+
+def bench(index: PrefixIndex) -> None:
+    rng = random.Random(1)
+    short = [index.keys[rng.randrange(ENTRIES)][:rng.randint(1, 2)] for _ in range(QUERIES)]
+    # first sight of each 3-4 character prefix, nothing memoized for it yet
+    cold = list({index.keys[rng.randrange(ENTRIES)][:rng.randint(3, 4)] for _ in range(QUERIES)})
+
+    report("pinned 1-2 chars", index, short)
+    report("cold 3-4 chars", index, cold)
+
+    started = time.perf_counter()
+    for row_id in range(ENTRIES, ENTRIES + 1000):
+        index.add(row_id, f"new{row_id}")
+    print(f"incremental insert: {(time.perf_counter() - started) / 1000 * 1000:.3f} ms/insert")
+
+    for row_id in rng.sample(range(ENTRIES), 1000):
+        index.bump(row_id, -1)
+    report("after 1000 decrements", index, short)
+
+
+async def rebuild(index: PrefixIndex, rows: list[tuple[int, str]], popularity: dict[int, int]) -> None:
+    # the largest gap between event loop ticks while the index is rebuilt in the background
+    stalls = []
+
+    async def heartbeat():
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(0.001)
+            stalls.append(time.perf_counter() - started - 0.001)
+
+    ticker = asyncio.create_task(heartbeat())
+    started = time.perf_counter()
+    await SuggestIndexes._rebuild(index, rows, dict(popularity))
+    elapsed = time.perf_counter() - started
+    ticker.cancel()
+
+    print(f"background rebuild: {elapsed:.2f} s, max loop stall {max(stalls) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    rows, popularity = dataset()
+    index = build(rows, popularity)
+    bench(index)
+
+    asyncio.run(rebuild(index, rows, popularity))
+    # a fresh snapshot: only the pinned prefixes are ranked ahead of time
+    bench(index)
+
+    started = time.perf_counter()
+    build_arrays(rows, popularity, config.pagination.suggest_size)
+    print(f"build_arrays alone: {time.perf_counter() - started:.2f} s")
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, status
 
-from src.apis.accounts import auth, profile
+from src.apis.accounts import auth, profile, resume
 from src.schema import response
 
 account_router = APIRouter(tags=["auth"], prefix="/account")
@@ -68,6 +68,13 @@ account_router.add_api_route(
     response_model=response.RegisterSkillResponse,
     status_code=status.HTTP_201_CREATED
 )
+account_router.add_api_route(
+    methods=["GET"],
+    path="/skills/suggest",
+    endpoint=profile.suggest_skill_handler,
+    response_model=list[response.SkillResponse],
+    status_code=status.HTTP_200_OK
+)
 account_router.add_api_route(
     methods=["GET"],
     path="/skills/registered",
@@ -131,6 +138,13 @@ account_router.add_api_route(
     response_model=list[response.GetEnterprisesResponse],
     status_code=status.HTTP_200_OK
 )
+account_router.add_api_route(
+    methods=["GET"],
+    path="/enterprises/suggest",
+    endpoint=profile.suggest_enterprise_handler,
+    response_model=list[response.SuggestEnterpriseResponse],
+    status_code=status.HTTP_200_OK
+)
 account_router.add_api_route(
     methods=["GET"],
     path="/enterprises/{enterprise_id}",
@@ -166,3 +180,10 @@ account_router.add_api_route(
     response_model=response.RegisterSkillResponse,
     status_code=status.HTTP_200_OK
 )
+account_router.add_api_route(
+    methods=["GET"],
+    path="/resume",
+    endpoint=resume.resume_handler,
+    response_model=response.GetResumeResponse,
+    status_code=status.HTTP_200_OK
+)
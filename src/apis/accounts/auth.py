@@ -12,10 +12,11 @@ async def user_sign_up_handler(
     user_service: UserService = Depends(),
     user_repo: AccountRepository = Depends(),
 ):
-    if await user_repo.get_user_by_email(user_email=request.email):
+    # probe before hashing so duplicate signups don't spend a bcrypt round
+    if await user_repo.email_exists(user_email=request.email):
         raise HTTPException(status_code=400, detail="already registered")
 
-    hashed_password: str = user_service.hash_password(plain_password=request.password)
+    hashed_password: str = await user_service.async_hash_password(plain_password=request.password)
     user: User = User(
         email=request.email,
         password=hashed_password,
@@ -25,8 +26,12 @@ async def user_sign_up_handler(
         is_admin=False,
         membership_id=request.membership_id,
     )
-    user: User = await user_repo.add_object(obj=user)
-    token: str = user_service.create_jwt(user.email)
+    user: User | None = await user_repo.add_user(user=user)
+
+    if user is None:
+        raise HTTPException(status_code=400, detail="already registered")
+
+    token: str = user_service.create_jwt(user=user)
 
     return JWTResponse(access_token=token)
 
@@ -41,13 +46,13 @@ async def user_login_handler(
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    verify: bool = user_service.verify_password(
+    verify: bool = await user_service.async_verify_password(
         plain_password=request.password, hashed_password=user.password
     )
 
     if not verify:
         raise HTTPException(status_code=401, detail="Invalid password")
 
-    token: str = user_service.create_jwt(user_email=user.email)
+    token: str = user_service.create_jwt(user=user)
 
     return JWTResponse(access_token=token)
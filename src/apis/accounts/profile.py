@@ -1,12 +1,21 @@
-from fastapi import HTTPException, Depends
+from fastapi import HTTPException, Depends, Query, Request
+from sqlalchemy.orm import sessionmaker
 
-from src.models.profile import Profile, Country, Skill, Career, Enterprise, Education
+from src import config
+from src.database import get_session_factory
+from src.models.profile import Profile, Country, Skill, Career, Enterprise, EnterpriseType, Industry, Education
 from src.models.accounts import User
 from src.models.repository import AccountRepository
-from src.schema.request import CreateProfileRequest, RegisterSkillRequest, RegisterCareerRequest, CreateEnterpriseRequest, RegisterEducationRequest
+from src.schema.request import CreateProfileRequest, UpdateProfileRequest, RegisterSkillRequest, RegisterCareerRequest, UpdateCareerRequest, CreateEnterpriseRequest, RegisterEducationRequest, UpdateEducationRequest
 
+from src.service.reference import reference_data
+from src.service.suggest import suggest_indexes
 from src.schema.response import CreateProfileResponse, GetProfileResponse, GetCountryResponse, RegisterSkillResponse, SkillResponse, GetCareerResponse, GetEducationResponse, GetEnterpriseResponse, GetEnterprisesResponse
-from src.interfaces.permission import get_access_token, Auths
+from src.interfaces.conditional import Conditional
+from src.interfaces.pagination import Page
+from src.interfaces.streaming import encoded_ndjson_response, ndjson_response, wants_ndjson
+from src.interfaces.permission import get_access_token, Auths, Principal
+from src.interfaces.serialization import encode, serialized
 
 
 async def profile_create_handler(
@@ -28,30 +37,35 @@ async def profile_create_handler(
     user.profiles.append(new_profile)
 
     await account_repo.add_object(user)
+    await account_repo.bump_user_version(user.id)
 
     return CreateProfileResponse(message="New profile created", data=new_profile)
 
 
 async def profile_lists_handler(
         token: str = Depends(get_access_token),
-        account_repo: AccountRepository = Depends()
+        account_repo: AccountRepository = Depends(),
+        conditional: Conditional = Depends(),
 ):
-    user: User = await Auths.basic_authentication(token=token, account_repo=account_repo, relation="Profile")
+    user: Principal = await Auths.claims_authentication(token=token, account_repo=account_repo)
 
-    return sorted(
-        [
-            GetProfileResponse(
-                id=profile.id,
-                name=profile.name,
-                occupation=profile.occupation,
-                personal_description=profile.personal_description,
-                region=profile.region,
-                country_name=profile.country.name
-            )
-            for profile in user.profiles
-        ],
-        key=lambda profile: profile.id,
-    )
+    if not_modified := conditional.not_modified(user.id, await account_repo.get_user_version(user.id)):
+        return not_modified
+
+    profiles = await account_repo.get_profiles(user_id=user.id)
+    countries = await reference_data.names(Country, account_repo.session, [profile.country_id for profile in profiles])
+
+    return conditional.apply(serialized([
+        {
+            "id": profile.id,
+            "name": profile.name,
+            "occupation": profile.occupation,
+            "personal_description": profile.personal_description,
+            "region": profile.region,
+            "country_name": countries[profile.country_id],
+        }
+        for profile in profiles
+    ]))
 
 
 async def profile_handler(
@@ -59,48 +73,46 @@ async def profile_handler(
         token: str = Depends(get_access_token),
         account_repo: AccountRepository = Depends(),
 ):
-    user: User = await Auths.basic_authentication(token=token, account_repo=account_repo)
+    user: Principal = await Auths.claims_authentication(token=token, account_repo=account_repo)
 
     profile = await account_repo.get_obj_by_id(obj=Profile, obj_id=profile_id)
 
     if not profile or profile.user_id != user.id:
         raise HTTPException(status_code=400, detail="Invalid profile id")
 
+    countries = await reference_data.names(Country, account_repo.session, [profile.country_id])
+
     return GetProfileResponse(
                 id=profile.id,
                 name=profile.name,
                 occupation=profile.occupation,
                 personal_description=profile.personal_description,
                 region=profile.region,
-                country_name=profile.country.name
+                country_name=countries[profile.country_id]
             )
 
 
 async def update_profile_handler(
-        request: CreateProfileRequest,
+        request: UpdateProfileRequest,
         token: str = Depends(get_access_token),
         account_repo: AccountRepository = Depends()
 ):
 
-    user: User = await Auths.basic_authentication(token=token, account_repo=account_repo)
+    user: Principal = await Auths.claims_authentication(token=token, account_repo=account_repo)
 
     if not request.profile_id:
         raise HTTPException(status_code=400, detail='profile id missed')
 
-    profile = await account_repo.get_obj_by_id(obj=Profile, obj_id=request.profile_id)
+    profile = await account_repo.update_owned_by(
+        Profile, request.profile_id, user.id, request.model_dump(exclude_unset=True, exclude={"profile_id"}), returning=True
+    )
 
-    if not profile or profile.user_id != user.id:
+    if not profile:
         raise HTTPException(status_code=400, detail='Invalid profile id')
 
-    profile.name = request.name
-    profile.occupation = request.occupation
-    profile.personal_description = request.personal_description
-    profile.region = request.region
-    profile.country_id = request.country_id
-
-    await account_repo.add_object(profile)
+    await account_repo.bump_user_version(user.id)
 
-    return CreateProfileResponse(message="Profile updated", data=profile)
+    return CreateProfileResponse(message="Profile updated", data=Profile(**profile))
 
 
 async def delete_profile_handler(
@@ -109,78 +121,87 @@ async def delete_profile_handler(
         account_repo: AccountRepository = Depends()
 ):
 
-    user: User = await Auths.basic_authentication(token=token, account_repo=account_repo)
+    user: Principal = await Auths.claims_authentication(token=token, account_repo=account_repo)
 
-    profile = await account_repo.get_obj_by_id(obj=Profile, obj_id=profile_id)
+    profile = await account_repo.delete_owned_by(Profile, profile_id, user.id, returning=True)
 
-    if not profile or profile.user_id != user.id:
+    if not profile:
         raise HTTPException(status_code=400, detail='Invalid profile id')
 
-    profile: Profile | None = await account_repo.delete_object(obj=profile)
+    await account_repo.bump_user_version(user.id)
 
-    return CreateProfileResponse(message="Profile deleted", data=profile)
+    return CreateProfileResponse(message="Profile deleted", data=Profile(**profile))
 
 
 async def get_country_list_handler(
+        request: Request,
         token: str = Depends(get_access_token),
-        account_repo: AccountRepository = Depends()
+        account_repo: AccountRepository = Depends(),
+        page: Page = Depends(),
 ):
-    await Auths.basic_authentication(token=token, account_repo=account_repo)
+    await Auths.claims_authentication(token=token, account_repo=account_repo)
 
-    countries: list[Country] = await account_repo.get_all_obj(obj=Country)
+    table = await reference_data.get(Country, account_repo.session)
 
-    return sorted(
-        [
-            GetCountryResponse(
-                id=country.id,
-                name=country.name
-            )
-            for country in countries
-        ],
-        key=lambda country: country.id
-    )
+    if wants_ndjson(request):
+        return encoded_ndjson_response(table.ndjson(after_id=page.after_id, batch_size=config.pagination.stream_batch_size))
+
+    return page.encoded_result(*table.page(after_id=page.after_id, limit=page.limit))
 
 
 async def register_skill_handler(
-        request: RegisterSkillRequest,
+        request: RegisterSkillRequest | list[RegisterSkillRequest],
         token: str = Depends(get_access_token),
         account_repo: AccountRepository = Depends(),
 ):
-    user: User = await Auths.basic_authentication(token=token, account_repo=account_repo, relation="Skill")
-
-    if request.id is not None:
-        skill = await account_repo.get_obj_by_id(obj=Skill, obj_id=request.id)
-
-    else:
-        skill_obj = Skill(name=request.name)
+    user: Principal = await Auths.claims_authentication(token=token, account_repo=account_repo)
 
-        skill: Skill = await account_repo.add_object(skill_obj)
+    requests = request if isinstance(request, list) else [request]
 
-    user.skills.append(skill)
+    skill_ids = [skill.id for skill in requests if skill.id is not None] + await account_repo.resolve_skill_ids(
+        [skill.name for skill in requests if skill.id is None]
+    )
 
-    await account_repo.add_object(obj=user)
+    if await account_repo.add_user_skills(user_id=user.id, skill_ids=skill_ids):
+        await account_repo.bump_user_version(user.id)
 
     return RegisterSkillResponse(message="Skill is registered")
 
 
 async def get_skill_list_handler(
+        request: Request,
         token: str = Depends(get_access_token),
-        account_repo: AccountRepository = Depends()
+        account_repo: AccountRepository = Depends(),
+        page: Page = Depends(),
+        conditional: Conditional = Depends(),
 ):
-    user: User = await Auths.basic_authentication(token=token, account_repo=account_repo)
+    user: Principal = await Auths.claims_authentication(token=token, account_repo=account_repo)
 
-    skill_list = await account_repo.get_all_obj(obj=Skill)
+    table = await reference_data.get(Skill, account_repo.session)
 
-    return sorted(
-        [
-            SkillResponse(
-                id=skill.id,
-                name=skill.name
-            )
-            for skill in skill_list
-        ],
-        key=lambda skill: skill.id
-    )
+    if not_modified := conditional.not_modified(table.version):
+        return not_modified
+
+    if wants_ndjson(request):
+        return conditional.apply(encoded_ndjson_response(
+            table.ndjson(after_id=page.after_id, batch_size=config.pagination.stream_batch_size)
+        ))
+
+    return conditional.apply(page.encoded_result(*table.page(after_id=page.after_id, limit=page.limit)))
+
+
+async def suggest_skill_handler(
+        q: str = "",
+        limit: int = Query(default=config.pagination.suggest_size, ge=1, le=config.pagination.suggest_size),
+        token: str = Depends(get_access_token),
+        account_repo: AccountRepository = Depends(),
+        session_factory: sessionmaker = Depends(get_session_factory),
+):
+    user: Principal = await Auths.claims_authentication(token=token, account_repo=account_repo)
+
+    await suggest_indexes.ensure(session_factory)
+
+    return serialized(suggest_indexes.skills.suggest(q, limit))
 
 
 async def filter_registered_skill_handler(
@@ -189,16 +210,16 @@ async def filter_registered_skill_handler(
 ):
     user: User = await Auths.basic_authentication(token=token, account_repo=account_repo, relation="Skill")
 
-    return sorted(
+    return serialized(sorted(
         [
-            SkillResponse(
-                id=skill.id,
-                name=skill.name
-            )
+            {
+                "id": skill.id,
+                "name": skill.name,
+            }
             for skill in user.skills
         ],
-        key=lambda skill: skill.id
-    )
+        key=lambda skill: skill["id"]
+    ))
 
 
 async def delete_registered_skill_handler(
@@ -206,87 +227,67 @@ async def delete_registered_skill_handler(
         token: str = Depends(get_access_token),
         account_repo: AccountRepository = Depends()
 ):
-    user: User = await Auths.basic_authentication(token=token, account_repo=account_repo, relation="Skill")
-
-    skills = [skill for skill in user.skills if skill.id != skill_id]
+    user: Principal = await Auths.claims_authentication(token=token, account_repo=account_repo)
 
-    user.skills = skills
-
-    await account_repo.add_object(user)
+    if await account_repo.delete_user_skill(user_id=user.id, skill_id=skill_id):
+        await account_repo.bump_user_version(user.id)
 
     return RegisterSkillResponse(message="Skill is deleted")
 
 
 async def register_career_handler(
-        request: RegisterCareerRequest,
+        request: RegisterCareerRequest | list[RegisterCareerRequest],
         token: str = Depends(get_access_token),
         account_repo: AccountRepository = Depends()
 ):
-    user: User = await Auths.basic_authentication(token=token, account_repo=account_repo)
-
-    career = Career(
-        position=request.position,
-        description=request.description,
-        start_time=request.start_time,
-        end_time=request.end_time,
-        enterprise_id=request.enterprise_id,
-        employment_type_id=request.employment_type_id
-    )
+    user: Principal = await Auths.claims_authentication(token=token, account_repo=account_repo)
 
-    new_career: Career = await account_repo.add_object(career)
+    requests = request if isinstance(request, list) else [request]
 
-    user.careers.append(new_career)
+    careers: list[Career] = await account_repo.add_objects([
+        Career(
+            position=career.position,
+            description=career.description,
+            start_time=career.start_time,
+            end_time=career.end_time,
+            enterprise_id=career.enterprise_id,
+            employment_type_id=career.employment_type_id
+        )
+        for career in requests
+    ])
 
-    await account_repo.add_object(user)
+    await account_repo.add_user_careers(user_id=user.id, careers=careers)
+    await account_repo.bump_user_version(user.id)
 
     return RegisterSkillResponse(message="Career is registered")
 
 
 async def get_career_list_handler(
         token: str = Depends(get_access_token),
-        account_repo: AccountRepository = Depends()
+        account_repo: AccountRepository = Depends(),
+        conditional: Conditional = Depends(),
 ):
-    user: User = await Auths.basic_authentication(token=token, account_repo=account_repo, relation="Career")
+    user: Principal = await Auths.claims_authentication(token=token, account_repo=account_repo)
 
-    return sorted(
-        [
-            GetCareerResponse(
-                id=career.id,
-                position=career.position,
-                description=career.description,
-                start_time=career.start_time,
-                end_time=career.end_time,
-                employment_type_id=career.employment_type.id,
-                employment_type_name=career.employment_type.name,
-                enterprise_id=career.enterprise.id,
-                enterprise_name=career.enterprise.name
-            )
-            for career in user.careers
-        ],
-        key=lambda career: career.id
-    )
+    if not_modified := conditional.not_modified(user.id, await account_repo.get_user_version(user.id)):
+        return not_modified
+
+    rows = await account_repo.get_career_rows(user_id=user.id, response_model=GetCareerResponse)
+
+    return conditional.apply(serialized(rows, GetCareerResponse))
 
 
 async def update_career_handler(
-        request: RegisterCareerRequest,
+        request: UpdateCareerRequest,
         token: str = Depends(get_access_token),
         account_repo: AccountRepository = Depends()
 ):
-    user: User = await Auths.basic_authentication(token=token, account_repo=account_repo, relation="Career")
+    user: Principal = await Auths.claims_authentication(token=token, account_repo=account_repo)
 
-    career: Career = await account_repo.get_obj_by_id(Career, request.id)
-
-    if career.id not in [reg_career.id for reg_career in user.careers]:
+    if not await account_repo.update_owned_by(Career, request.id, user.id, request.model_dump(exclude_unset=True, exclude={"id"})):
         raise HTTPException(status_code=400, detail="Invalid Career id")
 
-    career.position = request.position
-    career.description = request.description
-    career.start_time = request.start_time
-    career.end_time = request.end_time
-    career.enterprise_id = request.enterprise_id
-    career.employment_type_id = request.employment_type_id
-
-    career: Career = await account_repo.add_object(career)
+    await account_repo.bump_user_version(user.id)
 
     return RegisterSkillResponse(message="career updated")
 
@@ -296,14 +297,12 @@ async def delete_career_handler(
         token: str = Depends(get_access_token),
         account_repo: AccountRepository = Depends()
 ):
-    user: User = await Auths.basic_authentication(token=token, account_repo=account_repo, relation="Career")
-
-    career: Career = await account_repo.get_obj_by_id(Career, career_id)
+    user: Principal = await Auths.claims_authentication(token=token, account_repo=account_repo)
 
-    if career.id not in [reg_career.id for reg_career in user.careers]:
+    if not await account_repo.delete_linked(Career, career_id, user.id):
         raise HTTPException(status_code=400, detail="Invalid Career id")
 
-    deleted_career: Career = await account_repo.delete_object(career)
+    await account_repo.bump_user_version(user.id)
 
     return RegisterSkillResponse(message="Career is deleted")
 
@@ -313,7 +312,7 @@ async def register_new_enterprise_handler(
         token: str = Depends(get_access_token),
         account_repo: AccountRepository = Depends()
 ):
-    user: User = await Auths.basic_authentication(token=token, account_repo=account_repo)
+    user: Principal = await Auths.claims_authentication(token=token, account_repo=account_repo)
 
     enterprise = Enterprise(
         name=request.name,
@@ -329,24 +328,43 @@ async def register_new_enterprise_handler(
 
 
 async def enterprises_handler(
+        request: Request,
         token: str = Depends(get_access_token),
-        account_repo: AccountRepository = Depends()
+        account_repo: AccountRepository = Depends(),
+        page: Page = Depends(),
+        session_factory: sessionmaker = Depends(get_session_factory),
+        conditional: Conditional = Depends(),
 ):
-    user: User = await Auths.basic_authentication(token=token, account_repo=account_repo)
+    user: Principal = await Auths.claims_authentication(token=token, account_repo=account_repo)
 
-    enterprises: list[Enterprise] = await account_repo.get_all_obj(Enterprise)
+    if not_modified := conditional.not_modified(await account_repo.get_version(account_repo.table_version_key(Enterprise))):
+        return not_modified
 
-    return sorted(
-        [
-            GetEnterprisesResponse(
-                id=enterprise.id,
-                name=enterprise.name,
-                description=enterprise.description
-            )
-            for enterprise in enterprises
-        ],
-        key=lambda enterprise: enterprise.id
+    if wants_ndjson(request):
+        return conditional.apply(ndjson_response(
+            session_factory, account_repo.keyset_projection(obj=Enterprise, response_model=GetEnterprisesResponse, after_id=page.after_id)
+        ))
+
+    rows = await account_repo.get_page_projected(
+        obj=Enterprise, response_model=GetEnterprisesResponse, limit=page.fetch_size, after_id=page.after_id
     )
+    rows, last = page.split(rows)
+
+    return conditional.apply(page.encoded_result(encode(rows), last["id"] if last else None))
+
+
+async def suggest_enterprise_handler(
+        q: str = "",
+        limit: int = Query(default=config.pagination.suggest_size, ge=1, le=config.pagination.suggest_size),
+        token: str = Depends(get_access_token),
+        account_repo: AccountRepository = Depends(),
+        session_factory: sessionmaker = Depends(get_session_factory),
+):
+    user: Principal = await Auths.claims_authentication(token=token, account_repo=account_repo)
+
+    await suggest_indexes.ensure(session_factory)
+
+    return serialized(suggest_indexes.enterprises.suggest(q, limit))
 
 
 async def enterprise_handler(
@@ -354,17 +372,21 @@ async def enterprise_handler(
         token: str = Depends(get_access_token),
         account_repo: AccountRepository = Depends()
 ):
-    user: User = await Auths.basic_authentication(token=token, account_repo=account_repo)
+    user: Principal = await Auths.claims_authentication(token=token, account_repo=account_repo)
 
     enterprise: Enterprise = await account_repo.get_obj_by_id(Enterprise, enterprise_id)
 
+    enterprise_types = await reference_data.names(EnterpriseType, account_repo.session, [enterprise.enterprise_type_id])
+    industries = await reference_data.names(Industry, account_repo.session, [enterprise.industry_id])
+    countries = await reference_data.names(Country, account_repo.session, [enterprise.country_id])
+
     return GetEnterpriseResponse(
         id=enterprise.id,
         name=enterprise.name,
         description=enterprise.description,
-        enterprise_type_name=enterprise.enterprise_type.name,
-        industry_name=enterprise.industry.name,
-        country_name=enterprise.country.name
+        enterprise_type_name=enterprise_types[enterprise.enterprise_type_id],
+        industry_name=industries[enterprise.industry_id],
+        country_name=countries[enterprise.country_id]
     )
 
 
@@ -385,11 +407,10 @@ async def register_education_handler(
         enterprise_id=request.enterprise_id
     )
 
-    new_education: Education = await account_repo.add_object(education)
-
-    user.educations.append(new_education)
+    user.educations.append(education)
 
     await account_repo.add_object(user)
+    await account_repo.bump_user_version(user.id)
 
     return RegisterSkillResponse(message="Education is registered")
 
@@ -398,47 +419,38 @@ async def get_education_list_handler(
         token: str = Depends(get_access_token),
         account_repo: AccountRepository = Depends()
 ):
-    user: User = await Auths.basic_authentication(token=token, account_repo=account_repo, relation="Education")
+    user: User = await Auths.basic_authentication(token=token, account_repo=account_repo, relation={"educations.enterprise"})
 
-    return sorted(
+    return serialized(sorted(
         [
-            GetEducationResponse(
-                id=education.id,
-                major=education.major,
-                description=education.description,
-                start_time=education.start_time,
-                graduate_time=education.graduate_time,
-                grade=education.grade,
-                degree_type=education.degree_type,
-                enterprise_id=education.enterprise.id,
-                enterprise_name=education.enterprise.name
-            )
+            {
+                "id": education.id,
+                "major": education.major,
+                "description": education.description,
+                "start_time": education.start_time,
+                "graduate_time": education.graduate_time,
+                "grade": education.grade,
+                "degree_type": education.degree_type,
+                "enterprise_id": education.enterprise.id,
+                "enterprise_name": education.enterprise.name,
+            }
             for education in user.educations
         ],
-        key=lambda education: education.id
-    )
+        key=lambda education: education["id"]
+    ), GetEducationResponse)
 
 
 async def update_education_handler(
-        request: RegisterEducationRequest,
+        request: UpdateEducationRequest,
         token: str = Depends(get_access_token),
         account_repo: AccountRepository = Depends()
 ):
-    user: User = await Auths.basic_authentication(token=token, account_repo=account_repo, relation="Education")
-
-    education: Education = await account_repo.get_obj_by_id(Education, request.id)
+    user: Principal = await Auths.claims_authentication(token=token, account_repo=account_repo)
 
-    if education.id not in [reg_edu.id for reg_edu in user.educations]:
+    if not await account_repo.update_owned_by(Education, request.id, user.id, request.model_dump(exclude_unset=True, exclude={"id"})):
         raise HTTPException(status_code=400, detail="Invalid education id")
 
-    education.major = request.major
-    education.start_time = request.start_time
-    education.graduate_time = request.graduate_time
-    education.grade = request.grade
-    education.degree_type = request.degree_type
-    education.description = request.description
-
-    education: Education = await account_repo.add_object(education)
+    await account_repo.bump_user_version(user.id)
 
     return RegisterSkillResponse(message="education updated")
 
@@ -448,13 +460,11 @@ async def delete_education_handler(
         token: str = Depends(get_access_token),
         account_repo: AccountRepository = Depends()
 ):
-    user: User = await Auths.basic_authentication(token=token, account_repo=account_repo, relation="Education")
-
-    education: Education = await account_repo.get_obj_by_id(Education, education_id)
+    user: Principal = await Auths.claims_authentication(token=token, account_repo=account_repo)
 
-    if education.id not in [reg_edu.id for reg_edu in user.educations]:
+    if not await account_repo.delete_linked(Education, education_id, user.id):
         raise HTTPException(status_code=400, detail="Invalid education id")
 
-    deleted_career: Education = await account_repo.delete_object(education)
+    await account_repo.bump_user_version(user.id)
 
     return RegisterSkillResponse(message="Education is deleted")
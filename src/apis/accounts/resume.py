@@ -0,0 +1,98 @@
+import asyncio
+import time
+
+from fastapi import Depends
+from sqlalchemy.orm import sessionmaker
+
+from src import config
+from src.database import get_session_factory
+from src.models.profile import Country
+from src.models.repository import AccountRepository
+from src.service.reference import reference_data
+from src.schema.response import GetProfileResponse, SkillResponse, GetCareerResponse, GetEducationResponse, GetResumeResponse
+from src.interfaces.permission import get_access_token, Auths, Principal
+from src.interfaces.serialization import serialized
+
+
+async def resume_handler(
+        token: str = Depends(get_access_token),
+        account_repo: AccountRepository = Depends(),
+        session_factory: sessionmaker = Depends(get_session_factory),
+):
+    user: Principal = await Auths.claims_authentication(token=token, account_repo=account_repo)
+    # hand the auth lookup's connection back first, concurrent requests each holding one while waiting
+    # for more would drain the pool; the fan-out leaves at least one connection for other requests
+    await account_repo.session.close()
+    fan_out = asyncio.Semaphore(max(config.db.pool_size - 1, 1))
+
+    async def fetch(loader):
+        async with fan_out:
+            started = time.perf_counter()
+
+            async with session_factory() as session:
+                rows = await loader(AccountRepository(session=session), user_id=user.id)
+
+        return rows, (time.perf_counter() - started) * 1000
+
+    sections = {
+        "profiles": AccountRepository.get_profiles,
+        "skills": AccountRepository.get_skills,
+        "careers": AccountRepository.get_careers,
+        "educations": AccountRepository.get_educations,
+    }
+    results = await asyncio.gather(*[fetch(loader) for loader in sections.values()])
+
+    server_timing = ", ".join(
+        f"{section};dur={elapsed:.1f}" for section, (_, elapsed) in zip(sections, results)
+    )
+    (profiles, _), (skills, _), (careers, _), (educations, _) = results
+    countries = await reference_data.names(Country, account_repo.session, [profile.country_id for profile in profiles])
+
+    return serialized(GetResumeResponse(
+        profiles=[
+            GetProfileResponse(
+                id=profile.id,
+                name=profile.name,
+                occupation=profile.occupation,
+                personal_description=profile.personal_description,
+                region=profile.region,
+                country_name=countries[profile.country_id]
+            )
+            for profile in profiles
+        ],
+        skills=[
+            SkillResponse(
+                id=skill.id,
+                name=skill.name
+            )
+            for skill in skills
+        ],
+        careers=[
+            GetCareerResponse(
+                id=career.id,
+                position=career.position,
+                description=career.description,
+                start_time=career.start_time,
+                end_time=career.end_time,
+                employment_type_id=career.employment_type.id,
+                employment_type_name=career.employment_type.name,
+                enterprise_id=career.enterprise.id,
+                enterprise_name=career.enterprise.name
+            )
+            for career in careers
+        ],
+        educations=[
+            GetEducationResponse(
+                id=education.id,
+                major=education.major,
+                description=education.description,
+                start_time=education.start_time,
+                graduate_time=education.graduate_time,
+                grade=education.grade,
+                degree_type=education.degree_type,
+                enterprise_id=education.enterprise.id,
+                enterprise_name=education.enterprise.name
+            )
+            for education in educations
+        ],
+    ), headers={"Server-Timing": server_timing})
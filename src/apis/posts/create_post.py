@@ -3,10 +3,10 @@ from typing import Annotated
 
 from fastapi import Depends
 from pydantic import BaseModel, Field
-from sqlmodel.ext.asyncio.session import AsyncSession
 
-from src.apis.dependencies import get_session
+from src.interfaces.permission import Auths, Principal, get_access_token
 from src.models.post import Post
+from src.models.repository import AccountRepository, PostRepository
 
 
 class CreatePostRequest(BaseModel):
@@ -22,15 +22,20 @@ class CreatePostResponse(BaseModel):
 
 
 async def handler(
-    request: CreatePostRequest, session: Annotated[AsyncSession, Depends(get_session)]
+    request: CreatePostRequest,
+    token: Annotated[str, Depends(get_access_token)],
+    account_repo: Annotated[AccountRepository, Depends()],
+    post_repo: Annotated[PostRepository, Depends()],
 ) -> CreatePostResponse:
-    post = Post(
-        title=request.title,
-        content=request.content,
+    user: Principal = await Auths.claims_authentication(token=token, account_repo=account_repo)
+
+    post = await post_repo.add_object(
+        Post(
+            title=request.title,
+            content=request.content,
+            user_id=user.id,
+        )
     )
-    session.add(post)
-    await session.commit()
-    await session.refresh(post)
     return CreatePostResponse(
         id=post.id, title=post.title, content=post.content, created_at=post.created_at
     )
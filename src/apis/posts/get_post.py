@@ -1,12 +1,11 @@
 import datetime
 from typing import Annotated
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Response, status
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
-from sqlmodel.ext.asyncio.session import AsyncSession
 
-from src.apis.dependencies import get_session
-from src.models.post import Post
+from src.models.repository import PostRepository
 
 
 class GetPostResponse(BaseModel):
@@ -17,14 +16,9 @@ class GetPostResponse(BaseModel):
 
 
 async def handler(
-    post_id: int, session: Annotated[AsyncSession, Depends(get_session)]
-) -> GetPostResponse:
-    post = await session.get(Post, post_id)
-    if post is None:
+    post_id: int, post_repo: Annotated[PostRepository, Depends()]
+) -> Response:
+    body = await post_repo.get_post_body(post_id, GetPostResponse)
+    if body is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
-    return GetPostResponse(
-        id=post.id,
-        title=post.title,
-        content=post.content,
-        created_at=post.created_at,
-    )
+    return Response(content=body, media_type=JSONResponse.media_type)
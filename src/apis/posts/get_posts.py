@@ -1,27 +1,29 @@
+import datetime
 from typing import Annotated
 
-from fastapi import Depends
-from sqlmodel import select
-from sqlmodel.ext.asyncio.session import AsyncSession
+from fastapi import Depends, Query, Response
 
-from src.apis.dependencies import get_session
+from src import config
 from src.apis.posts.get_post import GetPostResponse
-from src.models.post import Post
+from src.interfaces.pagination import Page
+from src.interfaces.serialization import encode, serialized
+from src.models.repository import PostRepository
 
 
 async def handler(
-    session: Annotated[AsyncSession, Depends(get_session)]
-) -> list[GetPostResponse]:
-    posts = (await session.exec(select(Post))).all()
-    return sorted(
-        [
-            GetPostResponse(
-                id=post.id,
-                title=post.title,
-                content=post.content,
-                created_at=post.created_at,
-            )
-            for post in posts
-        ],
-        key=lambda post: -post.id,
+    post_repo: Annotated[PostRepository, Depends()],
+    page: Annotated[Page, Depends()],
+    ids: Annotated[list[int] | None, Query(max_length=config.pagination.max_size)] = None,
+) -> Response:
+    # ?ids=1&ids=2 hydrates a known set of posts in one query, otherwise the newest-first feed
+    if ids:
+        return serialized(await post_repo.get_posts_by_ids(ids, GetPostResponse))
+
+    rows = await post_repo.get_feed(
+        GetPostResponse, page.fetch_size, page.after_key(datetime.datetime.fromisoformat, int)
+    )
+    rows, last = page.split(rows)
+
+    return page.encoded_result(
+        encode(rows), (last["created_at"].isoformat(), last["id"]) if last else None
     )
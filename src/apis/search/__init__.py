@@ -0,0 +1,15 @@
+from fastapi import APIRouter, status
+
+from src.apis.posts.get_post import GetPostResponse
+from src.apis.search import search
+from src.schema.response import GetEnterprisesResponse
+
+search_router = APIRouter(tags=["search"])
+
+search_router.add_api_route(
+    methods=["GET"],
+    path="/search",
+    endpoint=search.handler,
+    response_model=list[GetPostResponse] | list[GetEnterprisesResponse],
+    status_code=status.HTTP_200_OK,
+)
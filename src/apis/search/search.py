@@ -0,0 +1,40 @@
+from typing import Annotated, Literal
+
+from fastapi import Depends, Query, Response
+
+from src.apis.posts.get_post import GetPostResponse
+from src.interfaces.pagination import Page
+from src.interfaces.permission import Auths, get_access_token
+from src.interfaces.serialization import encode
+from src.models.post import Post
+from src.models.profile import Enterprise
+from src.models.repository import AccountRepository, SearchRepository
+from src.schema.response import GetEnterprisesResponse
+
+# ?type= -> searched model and the fields returned for each hit
+SEARCH_TYPES = {
+    "post": (Post, GetPostResponse),
+    "enterprise": (Enterprise, GetEnterprisesResponse),
+}
+
+
+async def handler(
+    q: Annotated[str, Query(min_length=1, max_length=100)],
+    type: Literal["post", "enterprise"],
+    page: Annotated[Page, Depends()],
+    search_repo: Annotated[SearchRepository, Depends()],
+    account_repo: Annotated[AccountRepository, Depends()],
+    token: Annotated[str, Depends(get_access_token)],
+) -> Response:
+    await Auths.claims_authentication(token=token, account_repo=account_repo)
+
+    model, response_model = SEARCH_TYPES[type]
+    rows = await search_repo.search(
+        model, response_model, q, page.fetch_size, page.after_key(float, int)
+    )
+    rows, last = page.split(rows)
+
+    # score only orders the keyset, the response model leaves it out
+    return page.encoded_result(
+        encode(rows, response_model), (last["score"], last["id"]) if last else None
+    )
@@ -0,0 +1,91 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable
+
+from src import metrics
+
+
+class TTLCache:
+    def __init__(self, name: str, maxsize: int, ttl: float):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Any | None:
+        entry = self._entries.get(key)
+
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+                metrics.CACHE_SIZE.labels(self.name).set(len(self._entries))
+            metrics.CACHE_MISSES.labels(self.name).inc()
+            return None
+
+        self._entries.move_to_end(key)
+        metrics.CACHE_HITS.labels(self.name).inc()
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        self._entries[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            metrics.CACHE_EVICTIONS.labels(self.name).inc()
+
+        metrics.CACHE_SIZE.labels(self.name).set(len(self._entries))
+
+    def invalidate(self, key: Hashable) -> None:
+        # a load already in flight may have read the old value, it no longer gets to cache it
+        self._inflight.pop(key, None)
+        if self._entries.pop(key, None) is not None:
+            metrics.CACHE_SIZE.labels(self.name).set(len(self._entries))
+
+    def clear(self) -> None:
+        self._inflight.clear()
+        self._entries.clear()
+        metrics.CACHE_SIZE.labels(self.name).set(0)
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any | None:
+        while True:
+            value = self.get(key)
+            if value is not None:
+                return value
+
+            future = self._inflight.get(key)
+            if future is None:
+                return await self._load(key, loader)
+
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # the leader was cancelled, not this caller, so the load starts over
+                if not future.cancelled() or asyncio.current_task().cancelling():
+                    raise
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any | None:
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()
+            raise
+        else:
+            if value is not None and self._inflight.get(key) is future:
+                self.set(key, value)
+            future.set_result(value)
+            return value
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
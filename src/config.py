@@ -7,7 +7,20 @@ from pydantic_settings import BaseSettings
 class DatabaseConfig(BaseSettings):
     async_url: str = Field(default=os.getenv("ASYNC_DATABASE_URL"), alias="ASYNC_DATABASE_URL")
     sync_url: str = Field(default=os.getenv("SYNC_DATABASE_URL"), alias="SYNC_DATABASE_URL")
+    replica_url: str | None = Field(default=os.getenv("REPLICA_DATABASE_URL"), alias="REPLICA_DATABASE_URL")
+    # seconds a client keeps reading from the primary after a write request
+    replica_pin_seconds: int = Field(default=5, alias="DATABASE_REPLICA_PIN_SECONDS")
     echo: bool = Field(default=True, alias="DATABASE_ECHO")
+    # "queue" keeps a sized pool per worker, "static" shares a single connection (sqlite :memory:)
+    pool_class: str = Field(default="queue", alias="DATABASE_POOL_CLASS")
+    # 4 gunicorn workers * (pool_size + max_overflow) must stay below the server's max_connections
+    pool_size: int = Field(default=5, alias="DATABASE_POOL_SIZE")
+    max_overflow: int = Field(default=10, alias="DATABASE_MAX_OVERFLOW")
+    pool_timeout: float = Field(default=30.0, alias="DATABASE_POOL_TIMEOUT")
+    pool_recycle: int = Field(default=1800, alias="DATABASE_POOL_RECYCLE")
+    pool_pre_ping: bool = Field(default=True, alias="DATABASE_POOL_PRE_PING")
+    # dev/test: implicit lazy loads raise instead of silently issuing a query per row
+    raise_on_lazy_load: bool = Field(default=False, alias="DATABASE_RAISE_ON_LAZY_LOAD")
 
 
 class CORSConfig(BaseSettings):
@@ -17,6 +30,38 @@ class CORSConfig(BaseSettings):
     headers: str = Field(default="*", alias="CORS_HEADERS")
 
 
+class PasswordHashConfig(BaseSettings):
+    workers: int = Field(default=2, alias="PASSWORD_HASH_WORKERS")
+    # requests waiting for a free worker before new ones are rejected with 503
+    queue_size: int = Field(default=16, alias="PASSWORD_HASH_QUEUE_SIZE")
+
+
+class CacheConfig(BaseSettings):
+    user_size: int = Field(default=10000, alias="USER_CACHE_SIZE")
+    user_ttl: float = Field(default=60.0, alias="USER_CACHE_TTL")
+    # how long a revoked token can still pass claims-only authentication on other workers
+    token_version_ttl: float = Field(default=30.0, alias="TOKEN_VERSION_CACHE_TTL")
+    token_size: int = Field(default=10000, alias="TOKEN_CACHE_SIZE")
+    # upper bound, entries never outlive the token's own exp
+    token_ttl: float = Field(default=3600.0, alias="TOKEN_CACHE_TTL")
+    # countries, industries, enterprise/employment types and skills, other workers pick up writes after this
+    reference_ttl: float = Field(default=300.0, alias="REFERENCE_CACHE_TTL")
+    # skill/enterprise typeahead indexes are rebuilt in the background after this
+    suggest_ttl: float = Field(default=600.0, alias="SUGGEST_INDEX_TTL")
+    post_size: int = Field(default=10000, alias="POST_CACHE_SIZE")
+    # serialized GET /posts/{post_id} bodies, local updates invalidate immediately, other workers after this
+    post_ttl: float = Field(default=30.0, alias="POST_CACHE_TTL")
+
+
+class PaginationConfig(BaseSettings):
+    default_size: int = Field(default=100, alias="PAGE_SIZE_DEFAULT")
+    # hard cap, larger limits are rejected with 422
+    max_size: int = Field(default=1000, alias="PAGE_SIZE_MAX")
+    # rows fetched per round trip while streaming application/x-ndjson responses
+    stream_batch_size: int = Field(default=1000, alias="STREAM_BATCH_SIZE")
+    suggest_size: int = Field(default=10, alias="SUGGEST_SIZE_MAX")
+
+
 class WebConfig(BaseSettings):
     host: str = Field(default="0.0.0.0", alias="WEB_HOST")
     port: int = Field(default=8000, alias="WEB_PORT")
@@ -24,4 +69,7 @@ class WebConfig(BaseSettings):
 
 db = DatabaseConfig()
 cors = CORSConfig()
+password_hash = PasswordHashConfig()
+cache = CacheConfig()
+pagination = PaginationConfig()
 web = WebConfig()
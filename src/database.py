@@ -1,18 +1,74 @@
+import time
+
+from fastapi import Request, Response
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.exc import SQLAlchemyError
 from sqlmodel import SQLModel, pool
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.orm import Session, raiseload, sessionmaker
+
+from src import config, metrics
+from src.models import accounts, post, profile, version
+from src.models.search import create_search_indexes
+
+
+class MonitoredAsyncPool(AsyncAdaptedQueuePool):
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            metrics.DB_POOL_CHECKOUT_WAIT.labels(self.logging_name).set(time.perf_counter() - started)
+            self._export_usage()
+
+    def _do_return_conn(self, record) -> None:
+        super()._do_return_conn(record)
+        self._export_usage()
+
+    def _export_usage(self) -> None:
+        metrics.DB_POOL_SIZE.labels(self.logging_name).set(self.size())
+        metrics.DB_POOL_CHECKED_OUT.labels(self.logging_name).set(self.checkedout())
+        metrics.DB_POOL_OVERFLOW.labels(self.logging_name).set(max(self.overflow(), 0))
+
+
+def pool_options(name: str) -> dict:
+    if config.db.pool_class == "static":
+        return dict(poolclass=pool.StaticPool)
+
+    return dict(
+        poolclass=MonitoredAsyncPool,
+        pool_logging_name=name,
+        pool_size=config.db.pool_size,
+        max_overflow=config.db.max_overflow,
+        pool_timeout=config.db.pool_timeout,
+        pool_recycle=config.db.pool_recycle,
+        pool_pre_ping=config.db.pool_pre_ping,
+    )
 
-from src import config
-from src.models import accounts, profile
 
 async_engine = create_async_engine(
     url=config.db.async_url,
     echo=config.db.echo,
-    poolclass=pool.StaticPool,
+    **pool_options("primary"),
 )
 async_session = sessionmaker(bind=async_engine, class_=AsyncSession, expire_on_commit=False, autoflush=False, autocommit=False)
+
+if config.db.replica_url:
+    replica_engine = create_async_engine(
+        url=config.db.replica_url,
+        echo=config.db.echo,
+        **pool_options("replica"),
+    )
+else:
+    replica_engine = async_engine
+replica_session = sessionmaker(bind=replica_engine, class_=AsyncSession, expire_on_commit=False, autoflush=False, autocommit=False)
+
+READ_METHODS = {"GET", "HEAD"}
+PRIMARY_PIN_COOKIE = "db_primary_until"
+
+PENDING_COMMIT = "pending_commit"
+ON_COMMIT = "on_commit"
+
 engine = create_engine(url=config.db.sync_url)
 session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -20,6 +76,42 @@ session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 async def create_db_and_tables() -> None:
     async with async_engine.begin() as conn:
         await conn.run_sync(SQLModel.metadata.create_all)
+        await conn.run_sync(create_search_indexes)
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_flushed(session, flush_context) -> None:
+    session.info[PENDING_COMMIT] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_write_statement(orm_execute_state) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info[PENDING_COMMIT] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _raise_on_lazy_load(orm_execute_state) -> None:
+    # relationships must be requested with loader options, anything else reaching the database raises
+    if config.db.raise_on_lazy_load and orm_execute_state.is_select:
+        orm_execute_state.statement = orm_execute_state.statement.options(raiseload("*", sql_only=True))
+
+
+@event.listens_for(Session, "after_commit")
+def _run_commit_callbacks(session) -> None:
+    session.info.pop(PENDING_COMMIT, None)
+    for callback in session.info.pop(ON_COMMIT, []):
+        callback()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_commit_callbacks(session) -> None:
+    session.info.pop(PENDING_COMMIT, None)
+    session.info.pop(ON_COMMIT, None)
+
+
+def on_commit(session: AsyncSession, callback) -> None:
+    session.info.setdefault(ON_COMMIT, []).append(callback)
 
 
 def get_db():
@@ -30,11 +122,44 @@ def get_db():
         db.close()
 
 
-async def get_async_db() -> AsyncSession :
-    async with async_session() as asyncsession:
+def is_pinned_to_primary(request: Request) -> bool:
+    try:
+        return float(request.cookies.get(PRIMARY_PIN_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def pin_to_primary(response: Response) -> None:
+    response.set_cookie(
+        key=PRIMARY_PIN_COOKIE,
+        value=str(time.time() + config.db.replica_pin_seconds),
+        max_age=config.db.replica_pin_seconds,
+        httponly=True,
+    )
+
+
+def get_session_factory(request: Request, response: Response) -> sessionmaker:
+    if request.method not in READ_METHODS:
+        pin_to_primary(response)
+        return async_session
+
+    if is_pinned_to_primary(request):
+        return async_session
+
+    return replica_session
+
+
+async def get_async_db(request: Request, response: Response) -> AsyncSession :
+    session_factory = get_session_factory(request=request, response=response)
+
+    # unit of work: repositories only flush, the request commits once when the handler returns
+    async with session_factory() as asyncsession:
         try:
             yield asyncsession
-        except SQLAlchemyError as e:
+
+            if asyncsession.new or asyncsession.dirty or asyncsession.deleted or asyncsession.info.get(PENDING_COMMIT):
+                await asyncsession.commit()
+        except Exception as e:
             await asyncsession.rollback()
             raise e
         finally:
@@ -43,3 +168,5 @@ async def get_async_db() -> AsyncSession :
 
 async def close_db() -> None:
     await async_engine.dispose()
+    if replica_engine is not async_engine:
+        await replica_engine.dispose()
@@ -0,0 +1,38 @@
+import hashlib
+
+from fastapi import Request, Response, status
+
+
+class Conditional:
+    # strong ETags from a cheap version, so unchanged lists are answered with 304 before they are queried
+    def __init__(self, request: Request, response: Response):
+        self.request = request
+        self.response = response
+        self.headers: dict[str, str] = {}
+
+    def make_etag(self, *version) -> str:
+        source = "|".join([
+            *map(str, version),
+            self.request.url.path,
+            self.request.url.query,
+            self.request.headers.get("accept", ""),
+        ])
+
+        return f'"{hashlib.blake2b(source.encode(), digest_size=16).hexdigest()}"'
+
+    def not_modified(self, *version) -> Response | None:
+        etag = self.make_etag(*version)
+        self.headers = {"ETag": etag, "Cache-Control": "private, no-cache", "Vary": "Authorization, Accept"}
+        self.response.headers.update(self.headers)
+
+        if_none_match = self.request.headers.get("if-none-match", "")
+        if if_none_match.strip() == "*" or etag in [tag.strip() for tag in if_none_match.split(",")]:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=self.headers)
+
+        return None
+
+    def apply(self, response: Response) -> Response:
+        # for handlers returning a Response themselves, FastAPI drops headers set on the injected one
+        response.headers.update(self.headers)
+
+        return response
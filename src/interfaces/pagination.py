@@ -0,0 +1,93 @@
+import base64
+import binascii
+import json
+from typing import Any, Callable
+
+from fastapi import HTTPException, Query, Response
+from fastapi.responses import JSONResponse
+
+from src import config
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(*values) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values, separators=(",", ":")).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> list:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if not isinstance(values, list):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    return values
+
+
+class Page:
+    # keyset pagination: ?limit=&after=<cursor>, the next cursor is returned in the X-Next-Cursor header
+    def __init__(
+            self,
+            response: Response,
+            limit: int = Query(default=config.pagination.default_size, ge=1, le=config.pagination.max_size),
+            after: str | None = None,
+    ):
+        self.response = response
+        self.limit = limit
+        self.after = decode_cursor(after) if after else None
+
+    @property
+    def after_id(self) -> int | None:
+        if self.after is None:
+            return None
+
+        if len(self.after) != 1 or not isinstance(self.after[0], int):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+        return self.after[0]
+
+    def after_key(self, *types: Callable) -> tuple | None:
+        # composite keyset cursors, each value is parsed by the matching type, e.g. (datetime.fromisoformat, int)
+        if self.after is None:
+            return None
+
+        if len(self.after) != len(types):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+        try:
+            return tuple(parse(value) for parse, value in zip(types, self.after))
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    @property
+    def fetch_size(self) -> int:
+        # one extra row tells whether another page exists
+        return self.limit + 1
+
+    def split(self, rows: list) -> tuple[list, Any | None]:
+        # the page itself and its last row when another page follows
+        if len(rows) > self.limit:
+            rows = rows[:self.limit]
+            return rows, rows[-1]
+
+        return rows, None
+
+    def result(self, rows: list, key: Callable = lambda row: (row["id"],)) -> list:
+        rows, last = self.split(rows)
+
+        if last is not None:
+            self.response.headers[NEXT_CURSOR_HEADER] = encode_cursor(*key(last))
+
+        return rows
+
+    def encoded_result(self, content: bytes, last_key: int | tuple | None) -> Response:
+        # already serialized pages skip the response model, so the cursor goes on the returned response
+        if last_key is None:
+            headers = None
+        else:
+            headers = {NEXT_CURSOR_HEADER: encode_cursor(*last_key) if isinstance(last_key, tuple) else encode_cursor(last_key)}
+
+        return Response(content=content, media_type=JSONResponse.media_type, headers=headers)
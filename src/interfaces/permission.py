@@ -1,7 +1,10 @@
+from typing import Iterable
+
 from fastapi import HTTPException, Header, Depends
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from pydantic import BaseModel
 from src.models.accounts import User
-from src.service.accounts import UserService
+from src.service.accounts import CLAIMS_VERSION, UserService
 from src.models.repository import AccountRepository
 
 
@@ -14,24 +17,68 @@ def get_access_token(auth_header: HTTPAuthorizationCredentials | None = Depends(
     return auth_header.credentials
 
 
+class Principal(BaseModel):
+    id: int
+    email: str
+    is_admin: bool
+    is_business: bool
+    membership_id: int | None
+
+
 class Auths:
     @staticmethod
-    async def basic_authentication(token: str, account_repo: AccountRepository, relation=None) -> User:
-        verified = UserService().decode_jwt(access_token=token)
+    async def basic_authentication(
+        token: str, account_repo: AccountRepository, relation: str | Iterable[str] | None = None
+    ) -> User:
+        verified = UserService().decode_claims(access_token=token)
 
         if not verified:
             raise HTTPException(status_code=403, detail="Invalid token")
 
         if relation:
-            user = await account_repo.get_user_with_relation(user_email=verified, relation=relation)
+            user = await account_repo.get_user_with_relation(user_email=verified.sub, relation=relation)
         else:
-            user = await account_repo.get_user_by_email(user_email=verified)
+            user = await account_repo.get_user_by_email(user_email=verified.sub)
 
         if not user:
             raise HTTPException(status_code=403, detail="No user")
 
+        if verified.tv != user.token_version:
+            raise HTTPException(status_code=401, detail="Token revoked")
+
         return user
 
+    @staticmethod
+    async def claims_authentication(token: str, account_repo: AccountRepository) -> Principal:
+        verified = UserService().decode_claims(access_token=token)
+
+        if verified.ver != CLAIMS_VERSION:
+            user: User = await Auths.basic_authentication(token=token, account_repo=account_repo)
+
+            return Principal(
+                id=user.id,
+                email=user.email,
+                is_admin=user.is_admin,
+                is_business=user.is_business,
+                membership_id=user.membership_id,
+            )
+
+        token_version: int | None = await account_repo.get_token_version(user_id=verified.user_id)
+
+        if token_version is None:
+            raise HTTPException(status_code=403, detail="No user")
+
+        if verified.tv != token_version:
+            raise HTTPException(status_code=401, detail="Token revoked")
+
+        return Principal(
+            id=verified.user_id,
+            email=verified.sub,
+            is_admin=verified.is_admin,
+            is_business=verified.is_business,
+            membership_id=verified.membership_id,
+        )
+
     async def admin_permission(self, token: str, account_repo: AccountRepository) -> User:
         user: User = await self.basic_authentication(token=token, account_repo=account_repo)
 
@@ -39,4 +86,3 @@ class Auths:
             raise HTTPException(status_code=403, detail="Only admin user allowed")
 
         return user
-
@@ -0,0 +1,29 @@
+from functools import lru_cache
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+from pydantic_core import to_json
+
+
+@lru_cache
+def list_adapter(model: type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(list[model])
+
+
+def encode(rows: list, model: type[BaseModel] | None = None) -> bytes:
+    # rows already shaped like the response (trusted DB rows, RowMappings included) skip validation,
+    # others are validated exactly once
+    if model is None:
+        return to_json(rows, fallback=dict)
+
+    adapter = list_adapter(model)
+
+    return adapter.dump_json(adapter.validate_python(rows))
+
+
+def serialized(content: list | BaseModel, model: type[BaseModel] | None = None, headers: dict | None = None) -> Response:
+    # returning a Response makes FastAPI skip its second response_model validation and json.dumps
+    body = content.model_dump_json().encode() if isinstance(content, BaseModel) else encode(content, model)
+
+    return Response(content=body, media_type=JSONResponse.media_type, headers=headers)
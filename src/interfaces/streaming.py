@@ -0,0 +1,35 @@
+from typing import Iterable
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from pydantic_core import to_json
+from sqlalchemy import Select
+from sqlalchemy.orm import sessionmaker
+
+from src.models.repository import BaseRepository
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def wants_ndjson(request: Request) -> bool:
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+async def ndjson_lines(session_factory: sessionmaker, statement: Select):
+    # the request's own session is closed before the body is sent, so the stream opens its own
+    async with session_factory() as session:
+        async for rows in BaseRepository(session=session).stream_projected(statement):
+            yield b"\n".join(map(to_json, rows)) + b"\n"
+
+
+def ndjson_response(session_factory: sessionmaker, statement: Select) -> StreamingResponse:
+    return StreamingResponse(ndjson_lines(session_factory, statement), media_type=NDJSON_MEDIA_TYPE)
+
+
+def encoded_ndjson_response(batches: Iterable[bytes]) -> StreamingResponse:
+    # already encoded lines, sent from the event loop; StreamingResponse advances a plain iterator in a thread
+    async def send():
+        for batch in batches:
+            yield batch
+
+    return StreamingResponse(send(), media_type=NDJSON_MEDIA_TYPE)
@@ -14,19 +14,31 @@ from multiprocessing import Queue
 from src import config
 from src.apis.common import common_router
 from src.apis.accounts import account_router
-from src.database import close_db, create_db_and_tables
+from src.apis.posts import post_router
+from src.apis.search import search_router
+from src.database import async_session, close_db, create_db_and_tables
+from src.interfaces.pagination import NEXT_CURSOR_HEADER
+from src.service.accounts import password_executor
+from src.service.reference import reference_data
+from src.service.suggest import suggest_indexes
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await create_db_and_tables()
+    async with async_session() as session:
+        await reference_data.preload(session)
+        await suggest_indexes.load(session)
     yield
     await close_db()
+    password_executor.shutdown()
 
 
 app = FastAPI(lifespan=lifespan)
 app.include_router(common_router)
 app.include_router(account_router)
+app.include_router(post_router)
+app.include_router(search_router)
 
 app.add_middleware(
     CORSMiddleware,
@@ -34,6 +46,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=config.cors.methods.split(","),
     allow_headers=config.cors.headers.split(","),
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
 )
 app.add_middleware(
     CSRFMiddleware,
@@ -0,0 +1,26 @@
+from prometheus_client import Counter, Gauge
+
+DB_POOL_SIZE = Gauge(
+    "db_pool_size", "Configured number of persistent connections in the pool", ["engine"]
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out", "Connections currently checked out of the pool", ["engine"]
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow", "Overflow connections currently opened beyond pool size", ["engine"]
+)
+DB_POOL_CHECKOUT_WAIT = Gauge(
+    "db_pool_checkout_wait_seconds", "Time the last checkout waited for a connection", ["engine"]
+)
+
+EXECUTOR_QUEUE_DEPTH = Gauge(
+    "executor_queue_depth", "Tasks waiting for a free executor worker", ["executor"]
+)
+EXECUTOR_REJECTED = Counter(
+    "executor_rejected_total", "Tasks rejected because the executor queue was full", ["executor"]
+)
+
+CACHE_HITS = Counter("cache_hits_total", "Cache lookups served from memory", ["cache"])
+CACHE_MISSES = Counter("cache_misses_total", "Cache lookups that fell through to the loader", ["cache"])
+CACHE_EVICTIONS = Counter("cache_evictions_total", "Entries evicted to respect the size bound", ["cache"])
+CACHE_SIZE = Gauge("cache_size", "Entries currently held in the cache", ["cache"])
@@ -20,6 +20,7 @@ class User(SQLModel, table=True):
         default_factory=lambda: datetime.datetime.now(datetime.timezone.utc)
     )
     membership_id: int = Field(foreign_key="membership.id")
+    token_version: int = Field(default=0)
 
     skills: list["Skill"] = Relationship(back_populates="users", link_model=UserSkill)
     careers: list["Career"] = Relationship(back_populates="users", link_model=UserCareer)
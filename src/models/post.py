@@ -1,12 +1,19 @@
 import datetime
 
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel
 
 
 class Post(SQLModel, table=True):
+    __table_args__ = (
+        Index("post_created_at_id_idx", "created_at", "id"),
+    )
+
     id: int = Field(default=None, primary_key=True)
     title: str = Field(min_length=1, max_length=100)
     content: str = Field(max_length=500)
+    # the author, taken from the authenticated principal
+    user_id: int = Field(foreign_key="user.id")
     created_at: datetime.datetime = Field(
         default_factory=lambda: datetime.datetime.now(datetime.timezone.utc)
     )
@@ -1,7 +1,7 @@
 import datetime
 
 from sqlmodel import Field, SQLModel, Relationship
-from sqlalchemy import UniqueConstraint
+from sqlalchemy import UniqueConstraint, event
 from typing import Optional
 
 
@@ -67,15 +67,27 @@ class Country(SQLModel, table=True):
     enterprises: list["Enterprise"] = Relationship(back_populates="country")
 
 
+def normalize_name(name: str) -> str:
+    # "Python", " python " and "PYTHON" are the same skill
+    return " ".join(name.split()).casefold()
+
+
 class Skill(SQLModel, table=True):
     __tablename__ = "skill"
 
     id: int = Field(primary_key=True)
     name: str = Field(max_length=30)
+    normalized_name: str | None = Field(default=None, max_length=30, unique=True)
 
     users: list["User"] = Relationship(back_populates="skills", link_model=UserSkill)
 
 
+@event.listens_for(Skill, "before_insert")
+@event.listens_for(Skill, "before_update")
+def _normalize_skill_name(mapper, connection, skill: Skill) -> None:
+    skill.normalized_name = normalize_name(skill.name)
+
+
 class EmploymentType(SQLModel, table=True):
     __tablename__ = "employment_type"
 
@@ -99,7 +111,7 @@ class Profile(SQLModel, table=True):
     country_id: int = Field(foreign_key="country.id")
     user_id: int = Field(foreign_key="user.id")
 
-    country: Country | None = Relationship(back_populates="profiles", sa_relationship_kwargs=dict(lazy="joined"))
+    country: Country | None = Relationship(back_populates="profiles")
     user: "User" = Relationship(back_populates="profiles")
 
 
@@ -116,7 +128,7 @@ class Education(SQLModel, table=True):
     enterprise_id: int = Field(foreign_key="enterprise.id")
 
     users: list["User"] = Relationship(back_populates="educations", link_model=UserEducation)
-    enterprise: "Enterprise" = Relationship(back_populates="educations", sa_relationship_kwargs=dict(lazy="joined"))
+    enterprise: "Enterprise" = Relationship(back_populates="educations")
 
 
 class Enterprise(SQLModel, table=True):
@@ -129,9 +141,9 @@ class Enterprise(SQLModel, table=True):
     industry_id: int = Field(foreign_key="industry.id")
     country_id: int = Field(foreign_key="country.id")
 
-    country: Country | None = Relationship(back_populates="enterprises", sa_relationship_kwargs=dict(lazy="joined"))
-    industry: Industry | None = Relationship(back_populates="enterprises", sa_relationship_kwargs=dict(lazy="joined"))
-    enterprise_type: EnterpriseType | None = Relationship(back_populates="enterprises", sa_relationship_kwargs=dict(lazy="joined"))
+    country: Country | None = Relationship(back_populates="enterprises")
+    industry: Industry | None = Relationship(back_populates="enterprises")
+    enterprise_type: EnterpriseType | None = Relationship(back_populates="enterprises")
     careers: list["Career"] = Relationship(back_populates="enterprise")
     educations: list[Education] = Relationship(back_populates="enterprise")
 
@@ -148,5 +160,5 @@ class Career(SQLModel, table=True):
     employment_type_id: int = Field(foreign_key="employment_type.id")
 
     users: list["User"] = Relationship(back_populates="careers", link_model=UserCareer)
-    employment_type: EmploymentType | None = Relationship(back_populates="careers", sa_relationship_kwargs=dict(lazy="joined"))
-    enterprise: Enterprise | None = Relationship(back_populates="careers", sa_relationship_kwargs=dict(lazy="joined"))
+    employment_type: EmploymentType | None = Relationship(back_populates="careers")
+    enterprise: Enterprise | None = Relationship(back_populates="careers")
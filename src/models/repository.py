@@ -1,36 +1,354 @@
+import datetime
+from typing import AsyncIterator, Iterable
+
 from fastapi import Depends, HTTPException
-from sqlalchemy import select, text
-from sqlalchemy.orm import Session, selectinload
+from pydantic import BaseModel
+from pydantic_core import to_json
+from sqlalchemy import Delete, Select, Update, RowMapping, delete, func, insert, inspect, and_, column, exists, literal_column, or_, select, table, text, true, update
+from sqlalchemy.dialects import mysql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, joinedload, selectinload, make_transient_to_detached
 from sqlalchemy.ext.asyncio import AsyncSession
 from abc import abstractmethod, ABCMeta, ABC
 
-from src.database import get_db, get_async_db
+from src import config
+from src.cache import TTLCache
+from src.database import get_db, get_async_db, on_commit
 from src.models.accounts import User
-from src.models.profile import Profile, UserCareer, Career, Country, Skill, UserSkill, UserEducation, Education
+from src.models.post import Post
+from src.models.search import SEARCH_COLUMNS, search_index_name, search_terms
+from src.models.version import ResourceVersion
+from src.service.reference import REFERENCE_MODELS, reference_data
+from src.service.suggest import suggest_indexes
+from src.models.profile import Profile, UserCareer, Career, Country, Skill, UserSkill, UserEducation, Education, Enterprise, EmploymentType, normalize_name
+
+user_cache = TTLCache(name="user", maxsize=config.cache.user_size, ttl=config.cache.user_ttl)
+# legacy relation names accepted by get_user_with_relation
+RELATION_ALIASES = {
+    "Skill": "skills",
+    "Career": "careers",
+    "Profile": "profiles",
+    "Education": "educations",
+}
+
+# tables whose list endpoints answer conditional requests from a resource_version row
+VERSIONED_MODELS = {Enterprise}
+
+# typeahead indexes that pick up rows inserted through the repository
+SUGGEST_MODELS = {
+    Skill: suggest_indexes.skills,
+    Enterprise: suggest_indexes.enterprises,
+}
+
+# link table and column through which a user owns rows of a model
+OWNER_LINKS = {
+    Career: (UserCareer, UserCareer.career_id),
+    Education: (UserEducation, UserEducation.education_id),
+}
+
+# serialized single-post bodies, concurrent misses for one id share a single fetch
+post_cache = TTLCache(name="post", maxsize=config.cache.post_size, ttl=config.cache.post_ttl)
+
+token_version_cache = TTLCache(
+    name="token_version", maxsize=config.cache.user_size, ttl=config.cache.token_version_ttl
+)
 
 
 class BaseRepository:
     def __init__(self, session: AsyncSession = Depends(get_async_db)):
         self.session = session
 
+    # writes are flushed here and committed once by the get_async_db unit of work
     async def add_object(self, obj):
         self.session.add(instance=obj)
-        await self.session.commit()
-        await self.session.refresh(instance=obj)
+        await self.session.flush()
+
+        if isinstance(obj, User):
+            self._invalidate_users([obj])
+        await self._written(type(obj), [obj])
 
         return obj
 
     async def delete_object(self, obj):
-        self.session.delete(obj)
-        await self.session.commit()
+        await self.session.delete(obj)
+        await self.session.flush()
+
+        if isinstance(obj, User):
+            self._invalidate_users([obj])
+        if isinstance(obj, Post):
+            self._invalidate_posts([obj.id])
+        await self._written(type(obj))
+
         return obj
 
-    async def get_obj_by_id(self, obj, obj_id: int):
-        return await self.session.scalar(select(obj).where(obj.id == obj_id))
+    async def add_objects(self, objs: list, returning: bool = True) -> list:
+        # one batched INSERT; returning=False skips fetching primary keys
+        if not objs:
+            return objs
+
+        model = type(objs[0])
+
+        if not returning:
+            await self.session.execute(insert(model), [obj.model_dump(exclude_none=True) for obj in objs])
+        elif self.session.get_bind().dialect.insert_executemany_returning:
+            # the flush sends these as INSERT ... RETURNING batches
+            self.session.add_all(objs)
+        else:
+            await self._insert_with_ids(model, objs)
+
+        await self.session.flush()
+
+        if isinstance(objs[0], User):
+            self._invalidate_users(objs)
+        await self._written(type(objs[0]), objs if returning else [])
+
+        return objs
+
+    async def _insert_with_ids(self, model, objs: list) -> None:
+        # no RETURNING (mysql): one multi-row INSERT, and innodb gives a statement with a known row count
+        # a consecutive id block starting at LAST_INSERT_ID(), assuming auto_increment_increment = 1
+        rows = [obj.model_dump(exclude_none=True) for obj in objs]
+        columns = set().union(*rows)
+        result = await self.session.execute(insert(model).values([{name: row.get(name) for name in columns} for row in rows]))
+
+        for offset, obj in enumerate(objs):
+            if obj.id is None:
+                obj.id = result.lastrowid + offset
+            make_transient_to_detached(obj)
+
+        self.session.add_all(objs)
+
+    async def upsert_many(self, model, rows: list[dict], update_fields: list[str] | None = None) -> int:
+        # rows hitting a unique constraint update update_fields, or are skipped when none are given
+        if not rows:
+            return 0
+
+        result = await self.session.execute(self.upsert_statement(model, update_fields), rows)
+        await self._written(model)
+
+        return result.rowcount
+
+    def upsert_statement(self, model, update_fields: list[str] | None = None):
+        if self.session.get_bind().dialect.name == "mysql":
+            statement = mysql.insert(model.__table__)
+            if update_fields:
+                return statement.on_duplicate_key_update({field: statement.inserted[field] for field in update_fields})
+            return statement.prefix_with("IGNORE")
+
+        statement = sqlite.insert(model.__table__)
+        if update_fields:
+            return statement.on_conflict_do_update(set_={field: statement.excluded[field] for field in update_fields})
+        return statement.on_conflict_do_nothing()
+
+    async def delete_many(self, model, ids: list[int]) -> int:
+        if not ids:
+            return 0
+
+        if model is User:
+            # the user cache is keyed by email, read them while the rows still exist
+            users = (await self.session.execute(select(User.email, User.id).where(User.id.in_(ids)))).all()
+
+        result = await self.session.execute(delete(model).where(model.id.in_(ids)))
+
+        if model is User:
+            self._invalidate_users(users)
+        if model is Post:
+            self._invalidate_posts(ids)
+        await self._written(model)
+
+        return result.rowcount
+
+    async def update_owned(self, model, obj_id: int, owner, values: dict, returning: bool = False):
+        # one UPDATE guarded by the owner predicate, 0 rows means missing or not the caller's
+        if not values:
+            if returning:
+                return await self._select_owned(model, obj_id, owner)
+            return await self.session.scalar(
+                select(func.count()).select_from(model).where(model.id == obj_id, owner)
+            )
+
+        return await self._write_owned(update(model).values(values), model, obj_id, owner, returning)
+
+    async def delete_owned(self, model, obj_id: int, owner, returning: bool = False):
+        return await self._write_owned(delete(model), model, obj_id, owner, returning)
+
+    async def _write_owned(self, statement: Update | Delete, model, obj_id: int, owner, returning: bool):
+        # returns the affected row count, or the affected row itself when returning is set
+        statement = statement.where(model.id == obj_id, owner).execution_options(synchronize_session=False)
+        dialect = self.session.get_bind().dialect
+        is_update = isinstance(statement, Update)
+
+        if not returning:
+            # the mysql drivers report matched rows (CLIENT_FOUND_ROWS), so an unchanged row still counts
+            row = (await self.session.execute(statement)).rowcount
+        elif dialect.update_returning if is_update else dialect.delete_returning:
+            row = (await self.session.execute(statement.returning(*model.__table__.c))).mappings().first()
+        elif is_update:
+            # no RETURNING on this backend, read the written row back by its primary key
+            row = await self._select_owned(model, obj_id, owner) if (await self.session.execute(statement)).rowcount else None
+        else:
+            row = await self._select_owned(model, obj_id, owner, for_update=True)
+            if row is not None:
+                await self.session.execute(statement)
 
-    async def get_all_obj(self, obj):
+        if row:
+            if model is Post:
+                self._invalidate_posts([obj_id])
+            await self._written(model)
+
+        return row
+
+    async def _select_owned(self, model, obj_id: int, owner, for_update: bool = False) -> RowMapping | None:
+        statement = select(*model.__table__.c).where(model.id == obj_id, owner)
+
+        if for_update:
+            statement = statement.with_for_update()
+
+        return (await self.session.execute(statement)).mappings().first()
+
+    def _invalidate_users(self, users: list) -> None:
+        # once now for this request, once after commit so concurrent loads can't re-cache stale rows
+        keys = [(user.email, user.id) for user in users]
+
+        def invalidate():
+            for email, user_id in keys:
+                user_cache.invalidate(email)
+                token_version_cache.invalidate(user_id)
+
+        invalidate()
+        on_commit(self.session, invalidate)
+
+    def _invalidate_posts(self, ids: list[int]) -> None:
+        # once now for this request, once after commit so a concurrent miss can't re-cache the old body
+        def invalidate():
+            for post_id in ids:
+                post_cache.invalidate(post_id)
+
+        invalidate()
+        on_commit(self.session, invalidate)
+
+    async def _written(self, model, inserted: list | None = None) -> None:
+        if model in REFERENCE_MODELS:
+            if inserted:
+                # known rows are patched into the cached table instead of reloading all of it
+                on_commit(self.session, lambda: reference_data.add(model, inserted))
+            else:
+                reference_data.invalidate(model)
+                on_commit(self.session, lambda: reference_data.invalidate(model))
+
+        if inserted and model in SUGGEST_MODELS:
+            rows = [(obj.id, obj.name) for obj in inserted]
+            index = SUGGEST_MODELS[model]
+            on_commit(self.session, lambda: [index.add(row_id, name) for row_id, name in rows])
+
+        if model in VERSIONED_MODELS:
+            await self.bump_version(self.table_version_key(model))
+
+    @staticmethod
+    def table_version_key(model) -> str:
+        return f"table:{model.__tablename__}"
+
+    async def get_version(self, key: str) -> int:
+        return await self.session.scalar(select(ResourceVersion.version).where(ResourceVersion.key == key)) or 0
+
+    async def bump_version(self, key: str) -> None:
+        # one upsert in the caller's transaction, readers compare versions instead of rows
+        if self.session.get_bind().dialect.name == "mysql":
+            statement = mysql.insert(ResourceVersion.__table__).values(key=key, version=1)
+            statement = statement.on_duplicate_key_update(version=ResourceVersion.__table__.c.version + 1)
+        else:
+            statement = sqlite.insert(ResourceVersion.__table__).values(key=key, version=1)
+            statement = statement.on_conflict_do_update(set_={"version": ResourceVersion.__table__.c.version + 1})
+
+        await self.session.execute(statement)
+
+    @staticmethod
+    def eager_load(model, path: str):
+        # "careers.enterprise.industry" -> selectinload for collections, joinedload for many-to-one
+        option = None
+
+        for name in path.split("."):
+            relationship = inspect(model).relationships.get(name)
+
+            if relationship is None:
+                raise ValueError("Invalid Relation option")
+
+            attribute = getattr(model, name)
+
+            if relationship.uselist:
+                option = selectinload(attribute) if option is None else option.selectinload(attribute)
+            else:
+                option = joinedload(attribute) if option is None else option.joinedload(attribute)
+
+            model = relationship.mapper.class_
+
+        return option
+
+    @classmethod
+    def load_options(cls, model, relation: str | Iterable[str] | None) -> list:
+        if relation is None:
+            return []
+
+        paths = [relation] if isinstance(relation, str) else relation
+
+        return [cls.eager_load(model, path) for path in paths]
+
+    async def get_obj_by_id(self, obj, obj_id: int, relation: str | Iterable[str] | None = None):
+        return await self.session.scalar(
+            select(obj).options(*self.load_options(obj, relation)).where(obj.id == obj_id)
+        )
+
+    async def get_all_obj(self, obj, relation: str | Iterable[str] | None = None):
         #return await self.session.execute(select(obj)).scalars()
-        return list(await self.session.scalars(select(obj)))
+        return list(await self.session.scalars(select(obj).options(*self.load_options(obj, relation))))
+
+    async def stream_all_obj(self, obj, relation: str | Iterable[str] | None = None) -> AsyncIterator:
+        # server-side cursor, only one batch of entities is alive at a time
+        result = await self.session.stream_scalars(
+            select(obj)
+            .options(*self.load_options(obj, relation))
+            .order_by(obj.id)
+            .execution_options(yield_per=config.pagination.stream_batch_size)
+        )
+
+        async for item in result:
+            yield item
+
+    @staticmethod
+    def projection(obj, response_model: type[BaseModel], **columns) -> Select:
+        # selects only the response fields; columns maps fields that don't live on obj itself
+        return select(*[
+            (columns[field] if field in columns else getattr(obj, field)).label(field)
+            for field in response_model.model_fields
+        ])
+
+    async def get_projected(self, statement: Select) -> list[RowMapping]:
+        return list((await self.session.execute(statement)).mappings())
+
+    async def get_all_projected(self, obj, response_model: type[BaseModel]) -> list[RowMapping]:
+        return await self.get_projected(self.projection(obj, response_model).order_by(obj.id))
+
+    async def stream_projected(self, statement: Select) -> AsyncIterator[list[dict]]:
+        # yields one batch of plain dicts per round trip, zipping tuples is cheaper than RowMapping
+        result = await self.session.stream(statement.execution_options(yield_per=config.pagination.stream_batch_size))
+        keys = list(result.keys())
+
+        async for rows in result.partitions():
+            yield [dict(zip(keys, row)) for row in rows]
+
+    def keyset_projection(self, obj, response_model: type[BaseModel], after_id: int | None = None) -> Select:
+        # keyset on the primary key, each page is an index range scan regardless of its offset
+        statement = self.projection(obj, response_model).order_by(obj.id)
+
+        if after_id is not None:
+            statement = statement.where(obj.id > after_id)
+
+        return statement
+
+    async def get_page_projected(
+            self, obj, response_model: type[BaseModel], limit: int, after_id: int | None = None
+    ) -> list[RowMapping]:
+        return await self.get_projected(self.keyset_projection(obj, response_model, after_id).limit(limit))
 
     async def raw_query(self, statement):
         return await self.session.execute(text(statement)).mappings().fetchall()
@@ -39,19 +357,275 @@ class BaseRepository:
 class AccountRepository(BaseRepository):
 
     async def get_user_by_email(self, user_email: str) -> User | None:
-        return await self.session.scalar(select(User).where(User.email == user_email))
+        snapshot: User | None = await user_cache.get_or_load(
+            user_email, lambda: self._load_user_snapshot(user_email)
+        )
 
-    async def get_user_with_relation(self, user_email: str, relation) -> User | None:
-        if relation == "Skill":
-            return await self.session.scalar(select(User).options(selectinload(User.skills)).where(User.email == user_email))
+        if snapshot is None:
+            return None
 
-        elif relation == "Career":
-            return await self.session.scalar(select(User).options(selectinload(User.careers)).where(User.email == user_email))
+        return await self.session.merge(snapshot, load=False)
 
-        elif relation == "Profile":
-            return await self.session.scalar(select(User).options(selectinload(User.profiles)).where(User.email == user_email))
+    async def email_exists(self, user_email: str) -> bool:
+        # answered from the unique email index, no row is read
+        return await self.session.scalar(select(exists().where(User.email == user_email)))
 
-        elif relation == "Education":
-            return await self.session.scalar(select(User).options(selectinload(User.educations)).where(User.email == user_email))
-        else:
-            raise ValueError("Invalid Relation option")
+    async def add_user(self, user: User) -> User | None:
+        # the unique index on email settles concurrent signups, the losing insert returns None
+        try:
+            async with self.session.begin_nested():
+                return await self.add_object(user)
+        except IntegrityError:
+            # only a committed row with this email makes it a duplicate, the locking read sees it past the snapshot
+            taken = await self.session.scalar(select(User.id).where(User.email == user.email).with_for_update(read=True))
+            if taken is None:
+                raise
+            return None
+
+    @staticmethod
+    def user_version_key(user_id: int) -> str:
+        return f"user:{user_id}"
+
+    async def get_user_version(self, user_id: int) -> int:
+        return await self.get_version(self.user_version_key(user_id))
+
+    async def bump_user_version(self, user_id: int) -> None:
+        await self.bump_version(self.user_version_key(user_id))
+
+    async def get_token_version(self, user_id: int) -> int | None:
+        return await token_version_cache.get_or_load(
+            user_id, lambda: self.session.scalar(select(User.token_version).where(User.id == user_id))
+        )
+
+    async def _load_user_snapshot(self, user_email: str) -> User | None:
+        user = await self.session.scalar(select(User).where(User.email == user_email))
+
+        if user is None:
+            return None
+
+        snapshot = User(**user.model_dump())
+        make_transient_to_detached(snapshot)
+
+        return snapshot
+
+    async def get_user_with_relation(self, user_email: str, relation: str | Iterable[str]) -> User | None:
+        relations = [relation] if isinstance(relation, str) else relation
+        options = self.load_options(User, [RELATION_ALIASES.get(path, path) for path in relations])
+
+        return await self.session.scalar(select(User).options(*options).where(User.email == user_email))
+
+    @staticmethod
+    def owned_by(model, user_id: int):
+        # profiles carry their owner, careers and educations are owned through their link rows
+        if model is Profile:
+            return Profile.user_id == user_id
+
+        link, column = OWNER_LINKS[model]
+
+        return model.id.in_(select(column).where(link.user_id == user_id))
+
+    async def update_owned_by(self, model, obj_id: int, user_id: int, values: dict, returning: bool = False):
+        return await self.update_owned(model, obj_id, self.owned_by(model, user_id), values, returning)
+
+    async def delete_owned_by(self, model, obj_id: int, user_id: int, returning: bool = False):
+        return await self.delete_owned(model, obj_id, self.owned_by(model, user_id), returning)
+
+    async def delete_linked(self, model, obj_id: int, user_id: int) -> int:
+        # deleting the owner-scoped link row first checks ownership and keeps the foreign key satisfied
+        link, column = OWNER_LINKS[model]
+        result = await self.session.execute(delete(link).where(column == obj_id, link.user_id == user_id))
+
+        if not result.rowcount:
+            return 0
+
+        return await self.delete_owned(model, obj_id, true())
+
+    async def get_profiles(self, user_id: int) -> list[Profile]:
+        return list(await self.session.scalars(
+            select(Profile)
+            .where(Profile.user_id == user_id)
+            .order_by(Profile.id)
+        ))
+
+    async def get_skills(self, user_id: int) -> list[Skill]:
+        return list(await self.session.scalars(
+            select(Skill)
+            .join(UserSkill, UserSkill.skill_id == Skill.id)
+            .where(UserSkill.user_id == user_id)
+            .order_by(Skill.id)
+        ))
+
+    async def resolve_skill_ids(self, names: list[str]) -> list[int]:
+        # known names resolve from the warm reference index, only unseen names reach the database
+        if not names:
+            return []
+
+        table = await reference_data.get(Skill, self.session)
+        requested: dict[str, str] = {}
+        for name in names:
+            # the first spelling of a new skill becomes its display name
+            requested.setdefault(normalize_name(name), " ".join(name.split()))
+
+        ids = {key: table.ids_by_name[key] for key in requested if key in table.ids_by_name}
+        missing = {key: name for key, name in requested.items() if key not in ids}
+
+        if missing:
+            # names another worker inserted meanwhile hit the unique key and are skipped
+            await self.session.execute(
+                self.upsert_statement(Skill), [{"name": name, "normalized_name": key} for key, name in missing.items()]
+            )
+            created = (await self.session.execute(
+                select(Skill.id, Skill.name, Skill.normalized_name).where(Skill.normalized_name.in_(missing))
+            )).all()
+            ids.update((row.normalized_name, row.id) for row in created)
+
+            def publish():
+                reference_data.add(Skill, created)
+                for row in created:
+                    suggest_indexes.skills.add(row.id, row.name)
+
+            on_commit(self.session, publish)
+
+        # mysql stores a normalized name longer than the column truncated, under a key that was never asked for
+        if unresolved := [name for key, name in requested.items() if key not in ids]:
+            raise HTTPException(status_code=400, detail=f"Invalid skill name: {', '.join(unresolved)}")
+
+        return [ids[key] for key in requested]
+
+    async def add_user_skills(self, user_id: int, skill_ids: list[int]) -> int:
+        # userskill_uq makes registering an already registered skill a no-op
+        inserted = await self.upsert_many(UserSkill, [{"user_id": user_id, "skill_id": skill_id} for skill_id in skill_ids])
+
+        # a partial insert can't tell which links are new, popularity catches up on the next index rebuild
+        if inserted == len(skill_ids):
+            on_commit(self.session, lambda: [suggest_indexes.skills.bump(skill_id, 1) for skill_id in skill_ids])
+
+        return inserted
+
+    async def delete_user_skill(self, user_id: int, skill_id: int) -> int:
+        result = await self.session.execute(
+            delete(UserSkill).where(UserSkill.user_id == user_id, UserSkill.skill_id == skill_id)
+        )
+
+        if result.rowcount:
+            on_commit(self.session, lambda: suggest_indexes.skills.bump(skill_id, -1))
+
+        return result.rowcount
+
+    async def add_user_careers(self, user_id: int, careers: list[Career]) -> None:
+        await self.add_objects([UserCareer(user_id=user_id, career_id=career.id) for career in careers], returning=False)
+
+        enterprise_ids = [career.enterprise_id for career in careers]
+        on_commit(self.session, lambda: [suggest_indexes.enterprises.bump(enterprise_id, 1) for enterprise_id in enterprise_ids])
+
+    async def get_careers(self, user_id: int) -> list[Career]:
+        return list(await self.session.scalars(
+            select(Career)
+            .join(UserCareer, UserCareer.career_id == Career.id)
+            .options(joinedload(Career.enterprise), joinedload(Career.employment_type))
+            .where(UserCareer.user_id == user_id)
+            .order_by(Career.id)
+        ))
+
+    async def get_career_rows(self, user_id: int, response_model: type[BaseModel]) -> list[RowMapping]:
+        return await self.get_projected(
+            self.projection(
+                Career,
+                response_model,
+                employment_type_name=EmploymentType.name,
+                enterprise_name=Enterprise.name,
+            )
+            .join(UserCareer, UserCareer.career_id == Career.id)
+            .join(EmploymentType, EmploymentType.id == Career.employment_type_id)
+            .join(Enterprise, Enterprise.id == Career.enterprise_id)
+            .where(UserCareer.user_id == user_id)
+            .order_by(Career.id)
+        )
+
+    async def get_educations(self, user_id: int) -> list[Education]:
+        return list(await self.session.scalars(
+            select(Education)
+            .join(UserEducation, UserEducation.education_id == Education.id)
+            .options(joinedload(Education.enterprise))
+            .where(UserEducation.user_id == user_id)
+            .order_by(Education.id)
+        ))
+
+
+class PostRepository(BaseRepository):
+
+    def feed_projection(
+            self, response_model: type[BaseModel], before: tuple[datetime.datetime, int] | None = None
+    ) -> Select:
+        # newest first along post_created_at_id_idx, id breaks ties between posts created in the same instant
+        statement = self.projection(Post, response_model).order_by(Post.created_at.desc(), Post.id.desc())
+
+        if before is not None:
+            created_at, post_id = before
+            statement = statement.where(
+                or_(Post.created_at < created_at, and_(Post.created_at == created_at, Post.id < post_id))
+            )
+
+        return statement
+
+    async def get_feed(
+            self, response_model: type[BaseModel], limit: int, before: tuple[datetime.datetime, int] | None = None
+    ) -> list[RowMapping]:
+        return await self.get_projected(self.feed_projection(response_model, before).limit(limit))
+
+    async def get_post_body(self, post_id: int, response_model: type[BaseModel]) -> bytes | None:
+        return await post_cache.get_or_load(post_id, lambda: self._load_post_body(post_id, response_model))
+
+    async def _load_post_body(self, post_id: int, response_model: type[BaseModel]) -> bytes | None:
+        row = (await self.session.execute(self.projection(Post, response_model).where(Post.id == post_id))).mappings().first()
+
+        return None if row is None else to_json(row, fallback=dict)
+
+    async def get_posts_by_ids(self, ids: list[int], response_model: type[BaseModel]) -> list[RowMapping]:
+        # one IN query, rows come back in the requested order and unknown ids are skipped
+        rows = {
+            row["id"]: row
+            for row in await self.get_projected(self.projection(Post, response_model).where(Post.id.in_(ids)))
+        }
+
+        return [rows[post_id] for post_id in dict.fromkeys(ids) if post_id in rows]
+
+
+class SearchRepository(BaseRepository):
+
+    def search_projection(self, model, response_model: type[BaseModel], terms: list[str]) -> Select:
+        # rows containing every term plus a relevance score, higher is better on both backends
+        if self.session.get_bind().dialect.name == "mysql":
+            score = mysql.match(
+                *[getattr(model, name) for name in SEARCH_COLUMNS[model]],
+                against=" ".join(f"+{term}" for term in terms),
+            ).in_boolean_mode()
+
+            return self.projection(model, response_model).add_columns(score.label("score")).where(score)
+
+        index = table(search_index_name(model), column("rowid"))
+
+        return (
+            self.projection(model, response_model)
+            .add_columns((-func.bm25(literal_column(index.name))).label("score"))
+            .join(index, index.c.rowid == model.id)
+            .where(literal_column(index.name).op("MATCH")(" ".join(f'"{term}"' for term in terms)))
+        )
+
+    async def search(
+            self, model, response_model: type[BaseModel], query: str, limit: int, after: tuple[float, int] | None = None
+    ) -> list[RowMapping]:
+        # keyset on (score, id), the ranked subquery keeps the score usable in WHERE on FTS5
+        terms = search_terms(query)
+
+        if not terms:
+            return []
+
+        ranked = self.search_projection(model, response_model, terms).subquery()
+        statement = select(ranked).order_by(ranked.c.score.desc(), ranked.c.id)
+
+        if after is not None:
+            score, row_id = after
+            statement = statement.where(or_(ranked.c.score < score, and_(ranked.c.score == score, ranked.c.id > row_id)))
+
+        return await self.get_projected(statement.limit(limit))
@@ -0,0 +1,96 @@
+import re
+
+from sqlalchemy import Connection, text
+from sqlalchemy.exc import DBAPIError
+
+from src.models.post import Post
+from src.models.profile import Enterprise
+
+# models with a full-text index and the text columns it covers
+SEARCH_COLUMNS = {
+    Post: ("title", "content"),
+    Enterprise: ("name", "description"),
+}
+
+
+def search_index_name(model) -> str:
+    return f"{model.__tablename__}_fts"
+
+
+def search_terms(query: str) -> list[str]:
+    # words only, so user input can't reach FTS5 or boolean-mode operator syntax
+    return re.findall(r"\w+", query)
+
+
+# mysql "Duplicate key name", another run added the index between the check and the ALTER
+DUPLICATE_KEY_NAME = 1061
+
+
+def create_search_indexes(connection: Connection) -> None:
+    # runs at startup, idempotent, also indexes rows that existed before the index did.
+    # mysql FULLTEXT indexes are blocking DDL on large tables, they are added once by `make search-index`
+    if connection.dialect.name == "mysql":
+        return
+
+    for model, columns in SEARCH_COLUMNS.items():
+        _create_fts5_table(connection, model, columns)
+
+
+def create_fulltext_indexes(connection: Connection) -> None:
+    for model, columns in SEARCH_COLUMNS.items():
+        _create_fulltext_index(connection, model, columns)
+
+
+def _create_fulltext_index(connection: Connection, model, columns: tuple[str, ...]) -> None:
+    # innodb keeps FULLTEXT indexes in step with writes by itself
+    name = search_index_name(model)
+    exists = connection.execute(text(
+        "SELECT 1 FROM information_schema.statistics "
+        "WHERE table_schema = DATABASE() AND table_name = :table AND index_name = :name LIMIT 1"
+    ), {"table": model.__tablename__, "name": name}).first()
+
+    if exists is not None:
+        return
+
+    try:
+        connection.execute(text(f"ALTER TABLE {model.__tablename__} ADD FULLTEXT INDEX {name} ({', '.join(columns)})"))
+    except DBAPIError as e:
+        if e.orig.args[:1] != (DUPLICATE_KEY_NAME,):
+            raise
+
+
+def _create_fts5_table(connection: Connection, model, columns: tuple[str, ...]) -> None:
+    # external-content FTS5 table, triggers mirror every insert, update and delete on the base table
+    table, name = model.__tablename__, search_index_name(model)
+    names = ", ".join(columns)
+    new = ", ".join(f"new.{column}" for column in columns)
+    old = ", ".join(f"old.{column}" for column in columns)
+
+    created = connection.execute(text(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"
+    ), {"name": name}).first() is None
+
+    for statement in [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {name} USING fts5({names}, content='{table}', content_rowid='id')",
+        f"CREATE TRIGGER IF NOT EXISTS {name}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {name}(rowid, {names}) VALUES (new.id, {new}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {name}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {name}({name}, rowid, {names}) VALUES ('delete', old.id, {old}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {name}_au AFTER UPDATE ON {table} BEGIN "
+        f"INSERT INTO {name}({name}, rowid, {names}) VALUES ('delete', old.id, {old}); "
+        f"INSERT INTO {name}(rowid, {names}) VALUES (new.id, {new}); END",
+    ]:
+        connection.execute(text(statement))
+
+    if created:
+        connection.execute(text(f"INSERT INTO {name}({name}) VALUES ('rebuild')"))
+
+
+if __name__ == "__main__":
+    from src.database import engine
+
+    with engine.begin() as connection:
+        if connection.dialect.name == "mysql":
+            create_fulltext_indexes(connection)
+        else:
+            create_search_indexes(connection)
@@ -0,0 +1,8 @@
+from sqlmodel import Field, SQLModel
+
+
+class ResourceVersion(SQLModel, table=True):
+    __tablename__ = "resource_version"
+
+    key: str = Field(primary_key=True, max_length=60)
+    version: int = Field(default=0)
@@ -66,9 +66,18 @@ class CreateProfileRequest(BaseModel):
     profile_id: Optional[int] = None
 
 
+class UpdateProfileRequest(BaseModel):
+    profile_id: Optional[int] = None
+    name: Optional[constr(max_length=30, pattern=r"^[a-zA-Z가-힣]+")] = None
+    occupation: Optional[constr(max_length=30, pattern=r"^[a-zA-Z가-힣]+")] = None
+    personal_description: Optional[constr(max_length=255,pattern=r"^[a-zA-Z가-힣]+")] = None
+    region: Optional[constr(max_length=50, pattern=r"^[a-zA-Z가-힣]+")] = None
+    country_id: int = None
+
+
 class RegisterSkillRequest(BaseModel):
     id: Optional[int] = None
-    name: str
+    name: constr(max_length=30)
 
 
 class RegisterCareerRequest(BaseModel):
@@ -81,6 +90,16 @@ class RegisterCareerRequest(BaseModel):
     employment_type_id: int
 
 
+class UpdateCareerRequest(BaseModel):
+    id: int
+    position: constr(max_length=30, pattern=r"^[a-zA-Z가-힣]+") = None
+    description: constr(max_length=30, pattern=r"^[a-zA-Z가-힣]+") = None
+    start_time: date = None
+    end_time: Optional[date] = None
+    enterprise_id: int = None
+    employment_type_id: int = None
+
+
 class CreateEnterpriseRequest(BaseModel):
     name: constr(max_length=30, pattern=r"^[a-zA-Z가-힣]+")
     description: constr(max_length=30, pattern=r"^[a-zA-Z가-힣]+")
@@ -98,3 +117,15 @@ class RegisterEducationRequest(BaseModel):
     degree_type: Optional[constr(max_length=30, pattern=r"^[a-zA-Z가-힣]+")] = None
     description: Optional[constr(max_length=30, pattern=r"^[a-zA-Z가-힣]+")] = None
     enterprise_id: int
+
+
+class UpdateEducationRequest(BaseModel):
+    # fields left out stay unchanged, null is only accepted where the column allows it
+    id: int
+    major: constr(max_length=30, pattern=r"^[a-zA-Z가-힣]+") = None
+    start_time: date = None
+    graduate_time: Optional[date] = None
+    grade: Optional[constr(max_length=10)] = None
+    degree_type: constr(max_length=30, pattern=r"^[a-zA-Z가-힣]+") = None
+    description: Optional[constr(max_length=30, pattern=r"^[a-zA-Z가-힣]+")] = None
+    enterprise_id: int = None
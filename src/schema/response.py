@@ -61,6 +61,11 @@ class GetEducationResponse(BaseModel):
     enterprise_name: str
 
 
+class SuggestEnterpriseResponse(BaseModel):
+    id: int
+    name: str
+
+
 class GetEnterpriseResponse(BaseModel):
     id: int
     name: str
@@ -73,4 +78,11 @@ class GetEnterpriseResponse(BaseModel):
 class GetEnterprisesResponse(BaseModel):
     id: int
     name: str
-    description: str
\ No newline at end of file
+    description: str
+
+
+class GetResumeResponse(BaseModel):
+    profiles: list[GetProfileResponse]
+    skills: list[SkillResponse]
+    careers: list[GetCareerResponse]
+    educations: list[GetEducationResponse]
@@ -1,10 +1,39 @@
+import hashlib
 import os
+import time
 import bcrypt
 
 from datetime import datetime, timedelta
 from jose import jwt
 from jose.exceptions import ExpiredSignatureError, JWTError
 from fastapi import HTTPException
+from pydantic import BaseModel
+
+from src import config
+from src.cache import TTLCache
+from src.models.accounts import User
+from src.service.executor import BoundedExecutor
+
+password_executor = BoundedExecutor(
+    name="bcrypt",
+    max_workers=config.password_hash.workers,
+    max_queue=config.password_hash.queue_size,
+)
+token_cache = TTLCache(name="token", maxsize=config.cache.token_size, ttl=config.cache.token_ttl)
+
+# bump when the set of claims written by create_jwt changes
+CLAIMS_VERSION = 1
+
+
+class TokenClaims(BaseModel):
+    sub: str
+    exp: int
+    ver: int = 0
+    tv: int = 0
+    user_id: int | None = None
+    is_admin: bool = False
+    is_business: bool = False
+    membership_id: int | None = None
 
 
 class UserService:
@@ -25,17 +54,40 @@ class UserService:
             hashed_password.encode(self.encoding)
         )
 
-    def create_jwt(self, user_email: str) -> str:
+    async def async_hash_password(self, plain_password: str) -> str:
+        return await password_executor.run(self.hash_password, plain_password=plain_password)
+
+    async def async_verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        return await password_executor.run(
+            self.verify_password, plain_password=plain_password, hashed_password=hashed_password
+        )
+
+    def create_jwt(self, user: User) -> str:
         return jwt.encode(
         {
-            "sub": user_email,
-            "exp": datetime.now() + timedelta(days=7)
+            "sub": user.email,
+            "exp": datetime.now() + timedelta(days=7),
+            "ver": CLAIMS_VERSION,
+            "tv": user.token_version,
+            "user_id": user.id,
+            "is_admin": user.is_admin,
+            "is_business": user.is_business,
+            "membership_id": user.membership_id,
         },
             self.secret_key,
             algorithm=self.jwt_algorithm
         )
 
     def decode_jwt(self, access_token: str) -> str:
+        return self.decode_claims(access_token=access_token).sub
+
+    def decode_claims(self, access_token: str) -> TokenClaims:
+        digest: bytes = hashlib.sha256(access_token.encode(self.encoding)).digest()
+        claims: TokenClaims | None = token_cache.get(digest)
+
+        if claims is not None and claims.exp > time.time():
+            return claims
+
         try:
             payload: dict = jwt.decode(
                 access_token, self.secret_key, algorithms=[self.jwt_algorithm]
@@ -47,4 +99,7 @@ class UserService:
         except JWTError:
             raise HTTPException(status_code=401, detail="Invalid token")
 
-        return payload["sub"]
+        claims = TokenClaims(**payload)
+        token_cache.set(digest, claims, ttl=min(claims.exp - time.time(), token_cache.ttl))
+
+        return claims
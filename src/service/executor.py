@@ -0,0 +1,44 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import HTTPException
+
+from src import metrics
+
+
+class BoundedExecutor:
+    def __init__(self, name: str, max_workers: int, max_queue: int):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_pending = max_workers + max_queue
+        self.pending = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+
+    async def run(self, func, *args, **kwargs):
+        if self.pending >= self.max_pending:
+            metrics.EXECUTOR_REJECTED.labels(self.name).inc()
+            raise HTTPException(status_code=503, detail="Server busy", headers={"Retry-After": "1"})
+
+        with self._lock:
+            self.pending += 1
+        self._export_queue_depth()
+
+        # released when the work itself finishes, a cancelled caller doesn't stop a running hash
+        future = self._executor.submit(functools.partial(func, *args, **kwargs))
+        future.add_done_callback(self._release)
+
+        return await asyncio.wrap_future(future)
+
+    def _release(self, future) -> None:
+        with self._lock:
+            self.pending -= 1
+        self._export_queue_depth()
+
+    def _export_queue_depth(self) -> None:
+        metrics.EXECUTOR_QUEUE_DEPTH.labels(self.name).set(max(self.pending - self.max_workers, 0))
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,130 @@
+import bisect
+import hashlib
+from typing import Iterable, Iterator
+
+from pydantic_core import to_json
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src import config
+from src.cache import TTLCache
+from src.models.profile import Country, EmploymentType, EnterpriseType, Industry, Skill, normalize_name
+
+REFERENCE_MODELS = (Country, Industry, EnterpriseType, EmploymentType, Skill)
+HASH_BATCH_SIZE = 1000
+
+
+class ReferenceTable:
+    # a whole (id, name) table: sorted ids, id -> name, normalized name -> id and every row already encoded as JSON
+    def __init__(self, rows: list):
+        self.ids = [row.id for row in rows]
+        self.names = {row.id: row.name for row in rows}
+        self.ids_by_name = {normalize_name(row.name): row.id for row in rows}
+        self.encoded = [to_json({"id": row.id, "name": row.name}) for row in rows]
+        self._body: bytes | None = None
+        self._version: str | None = None
+
+    @property
+    def body(self) -> bytes:
+        if self._body is None:
+            self._body = b"[" + b",".join(self.encoded) + b"]"
+
+        return self._body
+
+    @property
+    def version(self) -> str:
+        # the digest of body, fed a slice of rows at a time so a large table's body is never built just for it
+        if self._version is None:
+            digest = hashlib.blake2b(b"[", digest_size=16)
+            for start in range(0, len(self.encoded), HASH_BATCH_SIZE):
+                digest.update((b"," if start else b"") + b",".join(self.encoded[start:start + HASH_BATCH_SIZE]))
+            digest.update(b"]")
+            self._version = digest.hexdigest()
+
+        return self._version
+
+    def add(self, rows: Iterable) -> None:
+        # rows written after the load go in place, kept in id order, without re-reading the table
+        for row in rows:
+            position = bisect.bisect_left(self.ids, row.id)
+            encoded = to_json({"id": row.id, "name": row.name})
+
+            if position < len(self.ids) and self.ids[position] == row.id:
+                previous = normalize_name(self.names[row.id])
+                if self.ids_by_name.get(previous) == row.id:
+                    del self.ids_by_name[previous]
+                self.encoded[position] = encoded
+            else:
+                self.ids.insert(position, row.id)
+                self.encoded.insert(position, encoded)
+
+            self.names[row.id] = row.name
+            self.ids_by_name[normalize_name(row.name)] = row.id
+
+        # body and version are rebuilt on the next read that needs them
+        self._body = self._version = None
+
+    def _start(self, after_id: int | None) -> int:
+        return 0 if after_id is None else bisect.bisect_right(self.ids, after_id)
+
+    def page(self, after_id: int | None, limit: int) -> tuple[bytes, int | None]:
+        # returns the JSON array and the last id when another page follows
+        start = self._start(after_id)
+        end = start + limit
+
+        if start == 0 and end >= len(self.ids):
+            return self.body, None
+
+        return b"[" + b",".join(self.encoded[start:end]) + b"]", self.ids[end - 1] if end < len(self.ids) else None
+
+    def ndjson(self, after_id: int | None, batch_size: int) -> Iterator[bytes]:
+        # a batch of lines at a time, each resumed after the last id sent so rows added meanwhile can't shift it
+        start = self._start(after_id)
+
+        while start < len(self.ids):
+            end = min(start + batch_size, len(self.ids))
+            last_id = self.ids[end - 1]
+            yield b"".join(line + b"\n" for line in self.encoded[start:end])
+            start = self._start(last_id)
+
+
+class ReferenceData:
+    def __init__(self, ttl: float):
+        self.tables = TTLCache(name="reference", maxsize=len(REFERENCE_MODELS), ttl=ttl)
+
+    async def get(self, model, session: AsyncSession) -> ReferenceTable:
+        return await self.tables.get_or_load(model.__tablename__, lambda: self._load(model, session))
+
+    async def names(self, model, session: AsyncSession, ids: Iterable[int]) -> dict[int, str]:
+        table = await self.get(model, session)
+
+        # rows added by another worker since the last load
+        if not set(ids) <= table.names.keys():
+            self.invalidate(model)
+            table = await self.get(model, session)
+
+        return table.names
+
+    async def preload(self, session: AsyncSession) -> None:
+        for model in REFERENCE_MODELS:
+            await self.get(model, session)
+
+    def add(self, model, rows: Iterable) -> None:
+        # a table that isn't cached picks the rows up on its next load
+        table = self.tables.get(model.__tablename__)
+
+        if table is not None:
+            table.add(rows)
+
+    def invalidate(self, model) -> None:
+        self.tables.invalidate(model.__tablename__)
+
+    def clear(self) -> None:
+        self.tables.clear()
+
+    @staticmethod
+    async def _load(model, session: AsyncSession) -> ReferenceTable:
+        return ReferenceTable((await session.execute(select(model.id, model.name).order_by(model.id))).all())
+
+
+reference_data = ReferenceData(ttl=config.cache.reference_ttl)
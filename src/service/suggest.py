@@ -0,0 +1,246 @@
+import asyncio
+import bisect
+import heapq
+import time
+from typing import Iterable
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src import config
+from src.models.profile import Career, Enterprise, Skill, UserCareer, UserSkill, normalize_name
+
+# prefixes matching more entries than this keep their ranked top list between queries
+MEMO_THRESHOLD = 256
+# prefixes up to this length get their top list at build time, they span the largest ranges
+PINNED_PREFIX_LENGTH = 2
+# entries a background thread handles before handing the GIL back to the event loop
+CHUNK = 10_000
+
+
+def build_arrays(
+        rows: Iterable[tuple[int, str]], popularity: dict[int, int], limit: int
+) -> tuple[list[str], list[int], dict[int, str], dict[str, list[int]]]:
+    # pure CPU work on its own data, safe to run off the event loop
+    def rank(row_id: int) -> int:
+        return popularity.get(row_id, 0)
+
+    buckets: dict[str, list[tuple[str, int, str]]] = {}
+    for position, (row_id, name) in enumerate(rows):
+        key = normalize_name(name)
+        buckets.setdefault(key[:PINNED_PREFIX_LENGTH], []).append((key, row_id, name))
+        if position % CHUNK == 0:
+            yield_gil()
+
+    # buckets on the longest pinned prefix concatenate in globally sorted order, and sorting them one by one
+    # keeps each C call short
+    keys: list[str] = []
+    ids: list[int] = []
+    names: dict[int, str] = {}
+    top: dict[str, list[int]] = {}
+
+    for prefix in sorted(buckets):
+        entries = sorted(buckets.pop(prefix))
+        bucket_ids = [row_id for _, row_id, _ in entries]
+
+        keys.extend(key for key, _, _ in entries)
+        ids.extend(bucket_ids)
+        names.update((row_id, name) for _, row_id, name in entries)
+        top[prefix] = heapq.nlargest(limit, bucket_ids, key=rank)
+        yield_gil()
+
+    # a shorter prefix ranks only its own exact key and its children's lists, fed in order so ties stay alphabetical
+    for length in range(PINNED_PREFIX_LENGTH, 0, -1):
+        children: dict[str, list[int]] = {}
+        for prefix in sorted(prefix for prefix in top if len(prefix) == length):
+            children.setdefault(prefix[:-1], []).extend(top[prefix])
+
+        for parent, candidates in children.items():
+            top[parent] = heapq.nlargest(limit, top.get(parent, []) + candidates, key=rank)
+
+    return keys, ids, names, top
+
+
+def release(containers: list) -> None:
+    # empties a replaced snapshot in small steps, freeing a million entries in one go would hold the GIL throughout
+    while containers:
+        container = containers.pop()
+        while container:
+            if isinstance(container, list):
+                del container[-CHUNK:]
+            else:
+                for _ in range(min(CHUNK, len(container))):
+                    container.popitem()
+            yield_gil()
+
+
+def yield_gil() -> None:
+    # a busy thread otherwise keeps the GIL for a whole switch interval each time the loop asks for it back
+    time.sleep(0)
+
+
+class PrefixIndex:
+    # names sorted by normalized form in two parallel arrays, a prefix is a bisect range
+    def __init__(self, name: str):
+        self.name = name
+        self.keys: list[str] = []
+        self.ids: list[int] = []
+        self.names: dict[int, str] = {}
+        self.popularity: dict[int, int] = {}
+        self.loaded_at: float | None = None
+        self._top: dict[str, list[int]] = {}
+        self._journal: list[tuple] | None = None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def build(self, rows: Iterable[tuple[int, str]], popularity: dict[int, int]) -> None:
+        self.swap(build_arrays(rows, popularity, config.pagination.suggest_size), popularity)
+
+    def begin_rebuild(self) -> None:
+        # writes seen while a new snapshot is being built are replayed onto it by swap
+        self._journal = []
+
+    def swap(self, arrays: tuple, popularity: dict[int, int]) -> list:
+        # returns the replaced containers, nothing on the loop holds on to them across an await
+        journal, self._journal = self._journal or [], None
+        replaced = [self.keys, self.ids, self.names, self._top, self.popularity]
+        self.keys, self.ids, self.names, self._top = arrays
+        self.popularity = popularity
+        self.loaded_at = time.monotonic()
+
+        for operation, *args in journal:
+            getattr(self, operation)(*args)
+
+        return replaced
+
+    def abort_rebuild(self) -> None:
+        self._journal = None
+
+    def add(self, row_id: int, name: str) -> None:
+        if self._journal is not None:
+            self._journal.append(("add", row_id, name))
+
+        if row_id in self.names:
+            return
+
+        key = normalize_name(name)
+        position = bisect.bisect_right(self.keys, key)
+        self.keys.insert(position, key)
+        self.ids.insert(position, row_id)
+        self.names[row_id] = name
+        self._rerank(row_id, key, insert=True)
+
+    def bump(self, row_id: int, delta: int) -> None:
+        if self._journal is not None:
+            self._journal.append(("bump", row_id, delta))
+
+        if row_id not in self.names:
+            return
+
+        self.popularity[row_id] = max(self.popularity.get(row_id, 0) + delta, 0)
+        # a decrement only reorders the lists it is in, an entry it may now trail catches up at the next rebuild
+        self._rerank(row_id, normalize_name(self.names[row_id]), insert=delta > 0)
+
+    def suggest(self, query: str, limit: int) -> list[dict]:
+        prefix = normalize_name(query)
+        ranked = self._top.get(prefix)
+
+        if ranked is None:
+            start = bisect.bisect_left(self.keys, prefix)
+            end = bisect.bisect_left(self.keys, prefix + "\U0010ffff", lo=start)
+            # ties keep alphabetical order, nlargest is stable
+            ranked = heapq.nlargest(
+                config.pagination.suggest_size, self.ids[start:end], key=lambda row_id: self.popularity.get(row_id, 0)
+            )
+
+            if end - start > MEMO_THRESHOLD:
+                self._top[prefix] = ranked
+
+        return [{"id": row_id, "name": self.names[row_id]} for row_id in ranked[:limit]]
+
+    def _rerank(self, row_id: int, key: str, insert: bool) -> None:
+        for prefix in self._prefixes(key):
+            top = self._top.get(prefix)
+            if top is None:
+                continue
+
+            if row_id not in top:
+                if not insert:
+                    continue
+                top.append(row_id)
+            # ties in alphabetical order, as a fresh ranking would have them
+            top.sort(key=lambda top_id: (-self.popularity.get(top_id, 0), normalize_name(self.names[top_id])))
+            del top[config.pagination.suggest_size:]
+
+    @staticmethod
+    def _prefixes(key: str) -> Iterable[str]:
+        return (key[:length] for length in range(len(key) + 1))
+
+
+class SuggestIndexes:
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.skills = PrefixIndex("skill")
+        self.enterprises = PrefixIndex("enterprise")
+        self._lock: asyncio.Lock | None = None
+        self._refresh: asyncio.Task | None = None
+
+    async def load(self, session: AsyncSession) -> None:
+        # queries run on the loop, sorting and ranking run in a thread and are swapped in at once;
+        # writes from the first query on are journaled, a replayed bump may count once more until the next rebuild
+        indexes = [self.skills, self.enterprises]
+        for index in indexes:
+            index.begin_rebuild()
+
+        try:
+            skill_popularity = await session.execute(
+                select(UserSkill.skill_id, func.count()).group_by(UserSkill.skill_id)
+            )
+            skill_rows = (await session.execute(select(Skill.id, Skill.name))).all()
+            await self._rebuild(self.skills, skill_rows, dict(skill_popularity.all()))
+
+            enterprise_popularity = await session.execute(
+                select(Career.enterprise_id, func.count())
+                .join(UserCareer, UserCareer.career_id == Career.id)
+                .group_by(Career.enterprise_id)
+            )
+            enterprise_rows = (await session.execute(select(Enterprise.id, Enterprise.name))).all()
+            await self._rebuild(self.enterprises, enterprise_rows, dict(enterprise_popularity.all()))
+        except BaseException:
+            for index in indexes:
+                index.abort_rebuild()
+            raise
+
+    @staticmethod
+    async def _rebuild(index: PrefixIndex, rows: list, popularity: dict[int, int]) -> None:
+        arrays = await asyncio.to_thread(build_arrays, rows, popularity, config.pagination.suggest_size)
+        await asyncio.to_thread(release, index.swap(arrays, popularity))
+
+    async def ensure(self, session_factory) -> None:
+        # first use builds inline, later rebuilds pick up other workers' writes in the background
+        if self.skills.loaded_at is None:
+            self._lock = self._lock or asyncio.Lock()
+            async with self._lock:
+                if self.skills.loaded_at is None:
+                    async with session_factory() as session:
+                        await self.load(session)
+            return
+
+        if time.monotonic() - self.skills.loaded_at > self.ttl and self._refresh is None:
+            self._refresh = asyncio.create_task(self._reload(session_factory))
+
+    async def _reload(self, session_factory) -> None:
+        try:
+            async with session_factory() as session:
+                await self.load(session)
+        finally:
+            self._refresh = None
+
+    def clear(self) -> None:
+        for index in [self.skills, self.enterprises]:
+            index.build([], {})
+            index.loaded_at = None
+
+
+suggest_indexes = SuggestIndexes(ttl=config.cache.suggest_ttl)
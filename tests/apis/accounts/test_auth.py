@@ -1,3 +1,4 @@
+import asyncio
 import datetime
 import os
 
@@ -8,11 +9,15 @@ from jose import jwt
 from jose.exceptions import ExpiredSignatureError
 from sqlmodel.ext.asyncio.session import AsyncSession
 from freezegun import freeze_time
+from sqlalchemy import delete
+from sqlalchemy.exc import IntegrityError
 
 from src.models.accounts import User
-from src.models.repository import AccountRepository
-from src.service.accounts import UserService
-from src.interfaces.permission import Auths
+from src import database
+from src.database import async_engine
+from src.models.repository import AccountRepository, user_cache
+from src.service.accounts import CLAIMS_VERSION, UserService
+from src.interfaces.permission import Auths, Principal
 
 
 @pytest.mark.asyncio
@@ -54,6 +59,12 @@ async def test_signup_successfully(client: AsyncClient, session: AsyncSession, m
         {
             "sub": "unittest@test.com",
             "exp": datetime.datetime.now() + datetime.timedelta(days=7),
+            "ver": CLAIMS_VERSION,
+            "tv": 0,
+            "user_id": None,
+            "is_admin": False,
+            "is_business": False,
+            "membership_id": 1,
         },
         os.getenv("SECRET_KEY"),
         algorithm="HS512",
@@ -71,18 +82,12 @@ async def test_signup_registered_case(
 ):
     user = mocker.patch.object(
         AccountRepository,
-        "get_user_by_email",
-        return_value=User(
-            id=None,
-            email="test@test.com",
-            password="hashed",
-            nickname=None,
-            phone_number="010-1111-1111",
-            is_business=False,
-            is_admin=False,
-            created_at=datetime.datetime.now(),
-            membership_id=1,
-        ),
+        "email_exists",
+        return_value=True,
+    )
+
+    hashed_password = mocker.patch.object(
+        UserService, "hash_password", return_value="hashed"
     )
 
     response = await client.post(
@@ -101,6 +106,46 @@ async def test_signup_registered_case(
     data = response.json()
 
     assert data == {"detail": "already registered"}
+    hashed_password.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_signup_concurrent_duplicate(client: AsyncClient, mocker):
+    # another signup committed the email between the probe and the insert
+    mocker.patch.object(AccountRepository, "email_exists", return_value=False)
+    mocker.patch.object(UserService, "hash_password", return_value="hashed")
+
+    async with database.async_session() as session:
+        session.add(User(email="race@test.com", password="hashed", phone_number="010-1111-1111", membership_id=1))
+        await session.commit()
+
+    response = await client.post(
+        url="/account/signup",
+        json={
+            "email": "race@test.com",
+            "password": "Plain123!",
+            "confirm_password": "Plain123!",
+            "phone_number": "010-1111-1111",
+            "membership_id": 1,
+        },
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json() == {"detail": "already registered"}
+
+    async with database.async_session() as session:
+        result = await session.execute(delete(User).where(User.email == "race@test.com"))
+        await session.commit()
+
+    assert result.rowcount == 1
+
+
+@pytest.mark.asyncio
+async def test_add_user_reraises_other_integrity_errors(client: AsyncClient):
+    # the NOT NULL violation names the email column but is no duplicate
+    async with database.async_session() as session:
+        with pytest.raises(IntegrityError):
+            await AccountRepository(session=session).add_user(User(email=None, password="hashed", membership_id=1))
 
 
 @pytest.mark.asyncio
@@ -131,6 +176,12 @@ async def test_login_successfully(client: AsyncClient, session: AsyncSession, mo
         {
             "sub": "test@test.com",
             "exp": datetime.datetime.now() + datetime.timedelta(days=7),
+            "ver": CLAIMS_VERSION,
+            "tv": 0,
+            "user_id": 1,
+            "is_admin": False,
+            "is_business": False,
+            "membership_id": 1,
         },
         os.getenv("SECRET_KEY"),
         algorithm="HS512",
@@ -189,7 +240,7 @@ async def test_login_wrong_password_case(
 
 @pytest.mark.asyncio
 async def test_expired_token():
-    exp_token = UserService().create_jwt(user_email="exptest@exptest.com")
+    exp_token = UserService().create_jwt(user=User(id=1, email="exptest@exptest.com", membership_id=1))
 
     with freeze_time(datetime.datetime.now() + datetime.timedelta(days=7)):
         try:
@@ -201,8 +252,6 @@ async def test_expired_token():
 
 @pytest.mark.asyncio
 async def test_basic_authentication(mocker):
-    test_token = UserService().create_jwt(user_email="test@test.com")
-
     test_user = User(
             id=1,
             email="test@test.com",
@@ -215,6 +264,8 @@ async def test_basic_authentication(mocker):
             membership_id=1,
         )
 
+    test_token = UserService().create_jwt(user=test_user)
+
     user = mocker.patch.object(
         AccountRepository,
         "get_user_by_email",
@@ -228,8 +279,6 @@ async def test_basic_authentication(mocker):
 
 @pytest.mark.asyncio
 async def test_admin_permission(mocker):
-    test_token = UserService().create_jwt(user_email="test@test.com")
-
     test_user = User(
         id=1,
         email="test@test.com",
@@ -242,6 +291,8 @@ async def test_admin_permission(mocker):
         membership_id=1,
     )
 
+    test_token = UserService().create_jwt(user=test_user)
+
     user = mocker.patch.object(
         AccountRepository,
         "get_user_by_email",
@@ -255,8 +306,6 @@ async def test_admin_permission(mocker):
 
 @pytest.mark.asyncio
 async def test_admin_permission_failed(mocker):
-    test_token = UserService().create_jwt(user_email="test@test.com")
-
     test_user = User(
         id=1,
         email="test@test.com",
@@ -269,6 +318,8 @@ async def test_admin_permission_failed(mocker):
         membership_id=1,
     )
 
+    test_token = UserService().create_jwt(user=test_user)
+
     user = mocker.patch.object(
         AccountRepository,
         "get_user_by_email",
@@ -278,3 +329,121 @@ async def test_admin_permission_failed(mocker):
         result = await Auths().admin_permission(token=test_token, account_repo=AccountRepository())
     except HTTPException:
         assert True
+
+
+@pytest.mark.asyncio
+async def test_get_user_by_email_cached_until_user_written(client: AsyncClient, mocker):
+    user_cache.clear()
+
+    async with AsyncSession(async_engine) as session:
+        session.add(User(email="cache@test.com", password="hashed", membership_id=1))
+        await session.commit()
+
+    async with AsyncSession(async_engine) as session:
+        account_repo = AccountRepository(session=session)
+        loader = mocker.spy(account_repo, "_load_user_snapshot")
+
+        users = await asyncio.gather(
+            *[account_repo.get_user_by_email(user_email="cache@test.com") for _ in range(5)]
+        )
+        cached_user = await account_repo.get_user_by_email(user_email="cache@test.com")
+
+        assert loader.call_count == 1
+        assert all(user is cached_user for user in users)
+        assert cached_user.email == "cache@test.com"
+
+        cached_user.nickname = "renamed"
+        await account_repo.add_object(obj=cached_user)
+        await session.commit()
+
+    async with AsyncSession(async_engine) as session:
+        user = await AccountRepository(session=session).get_user_by_email(user_email="cache@test.com")
+
+        assert user.nickname == "renamed"
+        await session.delete(user)
+        await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_delete_many_users_invalidates_only_their_entries(client: AsyncClient):
+    user_cache.clear()
+
+    async with database.async_session() as session:
+        session.add_all([
+            User(id=201, email="gone@test.com", password="hashed", membership_id=1),
+            User(id=202, email="kept@test.com", password="hashed", membership_id=1),
+        ])
+        await session.commit()
+
+    async with database.async_session() as session:
+        account_repo = AccountRepository(session=session)
+        await account_repo.get_user_by_email(user_email="gone@test.com")
+        await account_repo.get_user_by_email(user_email="kept@test.com")
+
+        assert await account_repo.delete_many(User, [201]) == 1
+        await session.commit()
+
+    assert user_cache.get("gone@test.com") is None
+    assert user_cache.get("kept@test.com").id == 202
+
+    async with database.async_session() as session:
+        await AccountRepository(session=session).delete_many(User, [202])
+        await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_claims_authentication_without_user_lookup(mocker):
+    test_user = User(
+        id=1,
+        email="test@test.com",
+        password="hashed",
+        is_business=True,
+        is_admin=False,
+        membership_id=2,
+    )
+    test_token = UserService().create_jwt(user=test_user)
+
+    user_lookup = mocker.patch.object(AccountRepository, "get_user_by_email")
+    mocker.patch.object(AccountRepository, "get_token_version", return_value=0)
+
+    principal: Principal = await Auths.claims_authentication(token=test_token, account_repo=AccountRepository())
+
+    assert principal == Principal(
+        id=1, email="test@test.com", is_admin=False, is_business=True, membership_id=2
+    )
+    user_lookup.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_claims_authentication_revoked_token(mocker):
+    test_token = UserService().create_jwt(user=User(id=1, email="test@test.com", membership_id=1))
+
+    mocker.patch.object(AccountRepository, "get_token_version", return_value=1)
+
+    with pytest.raises(HTTPException) as exc:
+        await Auths.claims_authentication(token=test_token, account_repo=AccountRepository())
+
+    assert exc.value.status_code == 401
+    assert exc.value.detail == "Token revoked"
+
+
+@pytest.mark.asyncio
+async def test_claims_authentication_legacy_token(mocker):
+    legacy_token = jwt.encode(
+        {
+            "sub": "test@test.com",
+            "exp": datetime.datetime.now() + datetime.timedelta(days=7),
+        },
+        os.getenv("SECRET_KEY"),
+        algorithm="HS512",
+    )
+
+    mocker.patch.object(
+        AccountRepository,
+        "get_user_by_email",
+        return_value=User(id=1, email="test@test.com", membership_id=1),
+    )
+
+    principal: Principal = await Auths.claims_authentication(token=legacy_token, account_repo=AccountRepository())
+
+    assert principal.id == 1
@@ -1,17 +1,27 @@
 import os
 import datetime
 import pytest
+import pytest_asyncio
 
 from dateutil.relativedelta import relativedelta
 from fastapi import status
 from httpx import AsyncClient
 from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import text
 from sqlalchemy.engine.row import RowMapping
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel, delete, select
+
+from src import config, database
+from src.database import async_engine
 
 from src.models.accounts import User
-from src.models.profile import Profile, Country, Skill, UserSkill, Career, UserCareer, Enterprise, EnterpriseType, EmploymentType, Education, UserEducation
+from src.models.profile import Profile, Country, Skill, UserSkill, Career, UserCareer, Enterprise, EnterpriseType, EmploymentType, Education, UserEducation, Industry
 from src.models.repository import AccountRepository
+from src.schema.response import GetCareerResponse, GetEnterprisesResponse
 from src.service.accounts import UserService
+from src.service.reference import ReferenceData, ReferenceTable
+from src.interfaces.pagination import NEXT_CURSOR_HEADER
 from src.interfaces.permission import Auths
 
 
@@ -155,7 +165,15 @@ async def test_profile_list_successfully(client: AsyncClient, session: AsyncSess
 
 
     mocker_user = mocker.patch.object(
-        Auths, "basic_authentication", return_value=test_user
+        Auths, "claims_authentication", return_value=test_user
+    )
+
+    mocker_profiles = mocker.patch.object(
+        AccountRepository, "get_profiles", return_value=test_user.profiles
+    )
+
+    mocker_countries = mocker.patch.object(
+        ReferenceData, "names", return_value={1: "South korea", 2: "North korea", 3: "International"}
     )
 
     response = await client.get(
@@ -227,13 +245,17 @@ async def test_get_profile_successfully(client: AsyncClient, session: AsyncSessi
     )
 
     mocker_user = mocker.patch.object(
-        Auths, "basic_authentication", return_value=test_user
+        Auths, "claims_authentication", return_value=test_user
     )
 
     mocker_profiles = mocker.patch.object(
         AccountRepository, "get_obj_by_id", return_value=mock_profile
     )
 
+    mocker_countries = mocker.patch.object(
+        ReferenceData, "names", return_value={1: "International"}
+    )
+
     response = await client.get(
         url="/account/profiles/1",
         headers={"Authorization": "Bearer test"},
@@ -268,7 +290,7 @@ async def test_get_profile_fail_invalid_id(client: AsyncClient, session: AsyncSe
     )
 
     mocker_user = mocker.patch.object(
-        Auths, "basic_authentication", return_value=test_user
+        Auths, "claims_authentication", return_value=test_user
     )
 
     response = await client.get(
@@ -322,15 +344,11 @@ async def test_update_profile_successfully(client: AsyncClient, session: AsyncSe
     )
 
     mocker_user = mocker.patch.object(
-        Auths, "basic_authentication", return_value=test_user
-    )
-
-    mocker_profiles = mocker.patch.object(
-        AccountRepository, "get_obj_by_id", return_value=mock_profile1
+        Auths, "claims_authentication", return_value=test_user
     )
 
     mocker_new_profile = mocker.patch.object(
-        AccountRepository, "add_object", return_value=mock_profile2
+        AccountRepository, "update_owned_by", return_value={**mock_profile2.model_dump(), "id": 1}
     )
 
     response = await client.patch(
@@ -379,7 +397,7 @@ async def test_update_profile_fail_without_id(client: AsyncClient, session: Asyn
     )
 
     mocker_user = mocker.patch.object(
-        Auths, "basic_authentication", return_value=test_user
+        Auths, "claims_authentication", return_value=test_user
     )
 
     response = await client.patch(
@@ -416,7 +434,7 @@ async def test_update_profile_fail_invalid_id(client: AsyncClient, session: Asyn
     )
 
     mocker_user = mocker.patch.object(
-        Auths, "basic_authentication", return_value=test_user
+        Auths, "claims_authentication", return_value=test_user
     )
 
     response = await client.patch(
@@ -454,7 +472,7 @@ async def test_delete_profile_successfully(client: AsyncClient, session: AsyncSe
     )
 
     mocker_user = mocker.patch.object(
-        Auths, "basic_authentication", return_value=test_user
+        Auths, "claims_authentication", return_value=test_user
     )
 
     mock_profile = Profile(
@@ -473,15 +491,11 @@ async def test_delete_profile_successfully(client: AsyncClient, session: AsyncSe
     )
 
     mocker_user = mocker.patch.object(
-        Auths, "basic_authentication", return_value=test_user
-    )
-
-    mocker_profile = mocker.patch.object(
-        AccountRepository, "get_obj_by_id", return_value=mock_profile
+        Auths, "claims_authentication", return_value=test_user
     )
 
     mocker_profile = mocker.patch.object(
-        AccountRepository, "delete_object", return_value=mock_profile
+        AccountRepository, "delete_owned_by", return_value=mock_profile.model_dump()
     )
 
     response = await client.delete(
@@ -522,7 +536,7 @@ async def test_delete_profile_fail_invalid_id(client: AsyncClient, session: Asyn
     )
 
     mocker_user = mocker.patch.object(
-        Auths, "basic_authentication", return_value=test_user
+        Auths, "claims_authentication", return_value=test_user
     )
 
     response = await client.delete(
@@ -563,11 +577,11 @@ async def test_country_list_successfully(client: AsyncClient, session: AsyncSess
     ]
 
     mocker_user = mocker.patch.object(
-        Auths, "basic_authentication", return_value=test_user
+        Auths, "claims_authentication", return_value=test_user
     )
 
     mocker_profiles = mocker.patch.object(
-        AccountRepository, "get_all_obj", return_value=test_countries
+        ReferenceData, "get", return_value=ReferenceTable(test_countries)
     )
 
     response = await client.get(
@@ -612,11 +626,15 @@ async def test_register_exist_skill_successfully(client: AsyncClient, session: A
     )
 
     mocker_user = mocker.patch.object(
-        Auths, "basic_authentication", return_value=test_user
+        Auths, "claims_authentication", return_value=test_user
+    )
+
+    mocker_new_skills = mocker.patch.object(
+        AccountRepository, "resolve_skill_ids", return_value=[test_skill.id]
     )
 
     mocker_relation = mocker.patch.object(
-        AccountRepository, "add_object", return_valie=test_skill
+        AccountRepository, "upsert_many", return_value=1
     )
 
     response = await client.post(
@@ -657,11 +675,15 @@ async def test_register_new_skill_successfully(client: AsyncClient, session: Asy
     )
 
     mocker_user = mocker.patch.object(
-        Auths, "basic_authentication", return_value=test_user
+        Auths, "claims_authentication", return_value=test_user
     )
 
-    mocker_skill = mocker.patch.object(
-        AccountRepository, "add_object", side_effects=[test_skill, test_user]
+    mocker_new_skills = mocker.patch.object(
+        AccountRepository, "resolve_skill_ids", return_value=[]
+    )
+
+    mocker_relation = mocker.patch.object(
+        AccountRepository, "upsert_many", return_value=1
     )
 
     response = await client.post(
@@ -712,11 +734,11 @@ async def test_all_skill_list_successfully(client: AsyncClient, session: AsyncSe
     ]
 
     mocker_user = mocker.patch.object(
-        Auths, "basic_authentication", return_value=test_user
+        Auths, "claims_authentication", return_value=test_user
     )
 
     mocker_new_skill = mocker.patch.object(
-        AccountRepository, "get_all_obj", return_value=test_skills
+        ReferenceData, "get", return_value=ReferenceTable(test_skills)
     )
 
     response = await client.get(
@@ -830,11 +852,11 @@ async def test_registered_skill_delete_successfully(client: AsyncClient, session
     )
 
     mocker_user = mocker.patch.object(
-        Auths, "basic_authentication", return_value=test_user
+        Auths, "claims_authentication", return_value=test_user
     )
 
     mocker_relation = mocker.patch.object(
-        AccountRepository, "add_object", return_value=test_user
+        AccountRepository, "delete_user_skill", return_value=1
     )
 
     response = await client.delete(
@@ -849,6 +871,7 @@ async def test_registered_skill_delete_successfully(client: AsyncClient, session
     assert data == {
         "message": "Skill is deleted"
     }
+    mocker_relation.assert_called_once_with(user_id=1, skill_id=2)
 
 
 @pytest.mark.asyncio
@@ -881,11 +904,11 @@ async def test_register_career_successfully(client: AsyncClient, session: AsyncS
     )
 
     mocker_user = mocker.patch.object(
-        Auths, "basic_authentication", return_value=test_user
+        Auths, "claims_authentication", return_value=test_user
     )
 
     mocker_relation = mocker.patch.object(
-        AccountRepository, "add_object", side_effects=[test_career, test_user]
+        AccountRepository, "add_objects", side_effect=[[test_career], []]
     )
 
     response = await client.post(
@@ -981,7 +1004,24 @@ async def test_registered_career_list_successfully(client: AsyncClient, session:
     )
 
     mocker_user = mocker.patch.object(
-        Auths, "basic_authentication", return_value=test_user
+        Auths, "claims_authentication", return_value=test_user
+    )
+
+    mocker_careers = mocker.patch.object(
+        AccountRepository, "get_career_rows", return_value=[
+            {
+                "id": career.id,
+                "position": career.position,
+                "description": career.description,
+                "start_time": career.start_time,
+                "end_time": career.end_time,
+                "employment_type_id": career.employment_type_id,
+                "employment_type_name": career.employment_type.name,
+                "enterprise_id": career.enterprise_id,
+                "enterprise_name": career.enterprise.name
+            }
+            for career in test_user.careers
+        ]
     )
 
     response = await client.get(
@@ -1085,15 +1125,11 @@ async def test_registered_career_delete_successfully(client: AsyncClient, sessio
             )
 
     mocker_user = mocker.patch.object(
-        Auths, "basic_authentication", return_value=test_user
-    )
-
-    mocker_career = mocker.patch.object(
-        AccountRepository, "get_obj_by_id", return_value=test_career
+        Auths, "claims_authentication", return_value=test_user
     )
 
     mocker_deletion = mocker.patch.object(
-        AccountRepository, "delete_object", return_value=test_career
+        AccountRepository, "delete_linked", return_value=1
     )
 
     response = await client.delete(
@@ -1287,7 +1323,7 @@ async def test_registered_education_delete_successfully(client: AsyncClient, ses
     )
 
     mocker_user = mocker.patch.object(
-        Auths, "basic_authentication", return_value=test_user
+        Auths, "claims_authentication", return_value=test_user
     )
 
     test_education = Education(
@@ -1302,11 +1338,7 @@ async def test_registered_education_delete_successfully(client: AsyncClient, ses
             )
 
     mocker_relation = mocker.patch.object(
-        AccountRepository, "get_obj_by_id", return_value=test_education
-    )
-
-    mocker_relation = mocker.patch.object(
-        AccountRepository, "delete_object", return_value=test_education
+        AccountRepository, "delete_linked", return_value=1
     )
 
     response = await client.delete(
@@ -1321,3 +1353,518 @@ async def test_registered_education_delete_successfully(client: AsyncClient, ses
     assert data == {
         "message": "Education is deleted"
     }
+
+
+@pytest_asyncio.fixture(scope="function")
+async def replica(mocker, tmp_path):
+    replica_engine = create_async_engine(url=f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}")
+
+    async with replica_engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+    async with AsyncSession(replica_engine) as replica_session:
+        replica_session.add(Country(id=1, name="Replica"))
+        await replica_session.commit()
+
+    mocker.patch.object(
+        database, "replica_session", async_sessionmaker(bind=replica_engine, expire_on_commit=False)
+    )
+    yield replica_engine
+    await replica_engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_country_list_reads_from_replica(client: AsyncClient, replica, mocker):
+    mocker.patch.object(Auths, "claims_authentication", return_value=User(id=1, email="test@test.com"))
+
+    response = await client.get(
+        url="/account/countries",
+        headers={"Authorization": "Bearer test"},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == [{"id": 1, "name": "Replica"}]
+
+
+@pytest.mark.asyncio
+async def test_country_list_pinned_to_primary_after_write(client: AsyncClient, replica, mocker):
+    mocker.patch.object(Auths, "claims_authentication", return_value=User(id=1, email="test@test.com"))
+    mocker.patch.object(AccountRepository, "add_object")
+
+    response = await client.post(
+        url="/account/enterprises",
+        headers={"Authorization": "Bearer test"},
+        json={
+            "name": "test",
+            "description": "test",
+            "enterprise_type_id": 1,
+            "industry_id": 1,
+            "country_id": 1
+        }
+    )
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert database.PRIMARY_PIN_COOKIE in response.cookies
+
+    response = await client.get(
+        url="/account/countries",
+        headers={"Authorization": "Bearer test"},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == []
+
+
+@pytest.mark.asyncio
+async def test_get_user_with_nested_relations(client: AsyncClient):
+    async with AsyncSession(async_engine) as session:
+        session.add_all([
+            EnterpriseType(id=1, name="Startup"),
+            Industry(id=1, name="Software"),
+            Country(id=1, name="South Korea"),
+            EmploymentType(id=1, name="Fulltime"),
+            Enterprise(id=1, name="test_ent", description="test", enterprise_type_id=1, industry_id=1, country_id=1),
+            Skill(id=1, name="python"),
+            User(id=1, email="relation@test.com", password="hashed", membership_id=1),
+        ])
+        session.add(Career(
+            id=1, position="Intern", start_time=datetime.datetime.now(), enterprise_id=1, employment_type_id=1
+        ))
+        session.add_all([UserCareer(user_id=1, career_id=1), UserSkill(user_id=1, skill_id=1)])
+        await session.commit()
+
+    async with database.async_session() as session:
+        user = await AccountRepository(session=session).get_user_with_relation(
+            user_email="relation@test.com", relation={"careers.enterprise.industry", "skills"}
+        )
+
+    assert [skill.name for skill in user.skills] == ["python"]
+    assert user.careers[0].enterprise.industry.name == "Software"
+
+    async with database.async_session() as session:
+        account_repo = AccountRepository(session=session)
+        skills = await account_repo.get_skills(user_id=1)
+        careers = await account_repo.get_careers(user_id=1)
+
+        career_rows = await account_repo.get_career_rows(user_id=1, response_model=GetCareerResponse)
+        enterprise_rows = await account_repo.get_all_projected(obj=Enterprise, response_model=GetEnterprisesResponse)
+
+    assert [skill.name for skill in skills] == ["python"]
+    assert careers[0].employment_type.name == "Fulltime"
+    assert list(career_rows[0].keys()) == list(GetCareerResponse.model_fields)
+    assert career_rows[0]["enterprise_name"] == "test_ent"
+    assert enterprise_rows == [{"id": 1, "name": "test_ent", "description": "test"}]
+
+    with pytest.raises(ValueError):
+        AccountRepository.eager_load(User, "careers.unknown")
+
+    async with AsyncSession(async_engine) as session:
+        for model in [UserCareer, UserSkill, Career, User, Skill, Enterprise, EmploymentType, Country, Industry, EnterpriseType]:
+            await session.exec(delete(model))
+        await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_register_skills_in_bulk_successfully(client: AsyncClient, mocker):
+    test_user = User(
+        id=1,
+        email="test@test.com",
+        password="hashed",
+        membership_id=1,
+    )
+
+    mocker_user = mocker.patch.object(
+        Auths, "claims_authentication", return_value=test_user
+    )
+
+    mocker_new_skills = mocker.patch.object(
+        AccountRepository, "resolve_skill_ids", return_value=[3]
+    )
+
+    mocker_relation = mocker.patch.object(
+        AccountRepository, "upsert_many", return_value=3
+    )
+
+    response = await client.post(
+        url="/account/skills",
+        headers={"Authorization": "Bearer test"},
+        json=[
+            {"id": 1, "name": "python"},
+            {"id": 2, "name": "go"},
+            {"name": "rust"}
+        ]
+    )
+
+    assert response.status_code == status.HTTP_201_CREATED
+    mocker_new_skills.assert_called_once_with(["rust"])
+    mocker_relation.assert_called_once_with(
+        UserSkill,
+        [
+            {"user_id": 1, "skill_id": 1},
+            {"user_id": 1, "skill_id": 2},
+            {"user_id": 1, "skill_id": 3},
+        ]
+    )
+
+
+@pytest.mark.asyncio
+async def test_bulk_write_in_single_commit(client: AsyncClient, mocker):
+    async with database.async_session() as session:
+        account_repo = AccountRepository(session=session)
+        commit = mocker.spy(session, "commit")
+
+        skills = await account_repo.add_objects([Skill(name=f"skill{number}") for number in range(3)])
+
+        assert all(skill.id is not None for skill in skills)
+
+        rows = [{"user_id": 1, "skill_id": skill.id} for skill in skills]
+
+        assert await account_repo.upsert_many(UserSkill, rows) == 3
+        assert await account_repo.upsert_many(UserSkill, rows) == 0
+
+        assert await account_repo.delete_many(Skill, [skill.id for skill in skills]) == 3
+        commit.assert_not_called()
+
+        await session.rollback()
+
+
+@pytest.mark.asyncio
+async def test_skill_list_keyset_pagination(client: AsyncClient, mocker):
+    mocker.patch.object(Auths, "claims_authentication", return_value=User(id=1, email="test@test.com"))
+
+    async with database.async_session() as session:
+        await AccountRepository(session=session).add_objects([Skill(id=skill_id, name=f"skill{skill_id}") for skill_id in range(1, 6)])
+        await session.commit()
+
+    pages = []
+    params = {"limit": 2}
+    while True:
+        response = await client.get(url="/account/skills", headers={"Authorization": "Bearer test"}, params=params)
+        assert response.status_code == status.HTTP_200_OK
+        pages.append([skill["id"] for skill in response.json()])
+
+        if NEXT_CURSOR_HEADER not in response.headers:
+            break
+        params = {"limit": 2, "after": response.headers[NEXT_CURSOR_HEADER]}
+
+    assert pages == [[1, 2], [3, 4], [5]]
+
+    response = await client.get(
+        url="/account/skills", headers={"Authorization": "Bearer test"}, params={"limit": config.pagination.max_size + 1}
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    response = await client.get(url="/account/skills", headers={"Authorization": "Bearer test"}, params={"after": "invalid"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json() == {"detail": "Invalid cursor"}
+
+    async with database.async_session() as session:
+        await AccountRepository(session=session).delete_many(Skill, list(range(1, 6)))
+        await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_country_list_served_from_reference_cache(client: AsyncClient, mocker):
+    mocker.patch.object(Auths, "claims_authentication", return_value=User(id=1, email="test@test.com"))
+    load = mocker.spy(ReferenceData, "_load")
+
+    async with database.async_session() as session:
+        await AccountRepository(session=session).add_objects([Country(id=1, name="South Korea")])
+        await session.commit()
+
+    for _ in range(2):
+        response = await client.get(url="/account/countries", headers={"Authorization": "Bearer test"})
+        assert response.json() == [{"id": 1, "name": "South Korea"}]
+
+    assert load.call_count == 1
+
+    async with database.async_session() as session:
+        await AccountRepository(session=session).add_object(Country(id=2, name="Japan"))
+        await session.commit()
+
+    response = await client.get(url="/account/countries", headers={"Authorization": "Bearer test"})
+
+    assert response.json() == [{"id": 1, "name": "South Korea"}, {"id": 2, "name": "Japan"}]
+    assert load.call_count == 1
+
+    async with database.async_session() as session:
+        await AccountRepository(session=session).delete_many(Country, [1, 2])
+        await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_profile_list_conditional_request(client: AsyncClient, mocker):
+    mocker.patch.object(Auths, "claims_authentication", return_value=User(id=1, email="test@test.com"))
+    mocker_profiles = mocker.patch.object(AccountRepository, "get_profiles", return_value=[])
+
+    response = await client.get(url="/account/profiles", headers={"Authorization": "Bearer test"})
+    etag = response.headers["ETag"]
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["Cache-Control"] == "private, no-cache"
+    assert response.headers["Vary"] == "Authorization, Accept"
+
+    response = await client.get(url="/account/profiles", headers={"Authorization": "Bearer test", "If-None-Match": etag})
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.headers["ETag"] == etag
+    assert mocker_profiles.call_count == 1
+
+    async with database.async_session() as session:
+        await AccountRepository(session=session).bump_user_version(1)
+        await session.commit()
+
+    response = await client.get(url="/account/profiles", headers={"Authorization": "Bearer test", "If-None-Match": etag})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["ETag"] != etag
+    assert mocker_profiles.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_enterprise_list_etag_changes_on_write(client: AsyncClient, mocker):
+    mocker.patch.object(Auths, "claims_authentication", return_value=User(id=1, email="test@test.com"))
+
+    response = await client.get(url="/account/enterprises", headers={"Authorization": "Bearer test"})
+    etag = response.headers["ETag"]
+
+    response = await client.get(url="/account/enterprises", headers={"Authorization": "Bearer test", "If-None-Match": etag})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    response = await client.post(
+        url="/account/enterprises",
+        headers={"Authorization": "Bearer test"},
+        json={"name": "test", "description": "test", "enterprise_type_id": 1, "industry_id": 1, "country_id": 1}
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+
+    response = await client.get(url="/account/enterprises", headers={"Authorization": "Bearer test", "If-None-Match": etag})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [enterprise["name"] for enterprise in response.json()] == ["test"]
+
+    async with database.async_session() as session:
+        await session.execute(delete(Enterprise))
+        await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_register_and_delete_skill_by_link_row(client: AsyncClient, mocker):
+    mocker.patch.object(Auths, "claims_authentication", return_value=User(id=1, email="test@test.com"))
+
+    async with database.async_session() as session:
+        await AccountRepository(session=session).add_objects([Skill(id=skill_id, name=f"skill{skill_id}") for skill_id in [1, 2]])
+        await session.commit()
+
+    for _ in range(2):
+        response = await client.post(url="/account/skills", headers={"Authorization": "Bearer test"}, json=[{"id": 1, "name": "skill1"}, {"id": 2, "name": "skill2"}])
+        assert response.status_code == status.HTTP_201_CREATED
+
+    for _ in range(2):
+        response = await client.delete(url="/account/skills/registered/1", headers={"Authorization": "Bearer test"})
+        assert response.status_code == status.HTTP_200_OK
+
+    async with database.async_session() as session:
+        account_repo = AccountRepository(session=session)
+        skills = await account_repo.get_skills(user_id=1)
+
+        await account_repo.delete_user_skill(user_id=1, skill_id=2)
+        await account_repo.delete_many(Skill, [1, 2])
+        await session.commit()
+
+    assert [skill.id for skill in skills] == [2]
+
+
+@pytest.mark.asyncio
+async def test_skill_names_are_normalized(client: AsyncClient, mocker):
+    async with database.async_session() as session:
+        account_repo = AccountRepository(session=session)
+        ids = await account_repo.resolve_skill_ids(["Python", " python ", "Go  lang"])
+        await session.commit()
+
+    async with database.async_session() as session:
+        account_repo = AccountRepository(session=session)
+        # the new skills were added to the cached table on commit, nothing is reloaded or queried
+        load = mocker.spy(ReferenceData, "_load")
+        execute = mocker.spy(session, "execute")
+
+        assert await account_repo.resolve_skill_ids(["PYTHON", "go lang"]) == ids
+        load.assert_not_called()
+        execute.assert_not_called()
+
+        skills = await account_repo.get_all_obj(Skill)
+        await account_repo.delete_many(Skill, ids)
+        await session.commit()
+
+    assert len(ids) == 2
+    assert [(skill.name, skill.normalized_name) for skill in skills] == [("Python", "python"), ("Go lang", "go lang")]
+
+
+@pytest.mark.asyncio
+async def test_skill_names_longer_than_the_column_are_rejected(client: AsyncClient, mocker):
+    mocker.patch.object(Auths, "claims_authentication", return_value=User(id=1, email="test@test.com"))
+
+    response = await client.post(url="/account/skills", headers={"Authorization": "Bearer test"}, json=[{"name": "x" * 31}])
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    # "ß" casefolds to "ss", so the normalized name outgrows the column; emulate mysql truncating it
+    async with database.async_engine.begin() as conn:
+        await conn.execute(text(
+            "CREATE TRIGGER skill_truncate AFTER INSERT ON skill BEGIN "
+            "UPDATE skill SET normalized_name = substr(normalized_name, 1, 30) WHERE id = new.id; END"
+        ))
+
+    try:
+        response = await client.post(url="/account/skills", headers={"Authorization": "Bearer test"}, json=[{"name": "ß" * 30}])
+    finally:
+        async with database.async_engine.begin() as conn:
+            await conn.execute(text("DROP TRIGGER skill_truncate"))
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    async with database.async_session() as session:
+        assert await AccountRepository(session=session).get_all_obj(Skill) == []
+
+
+@pytest.mark.asyncio
+async def test_suggest_skills_by_popularity(client: AsyncClient, mocker):
+    mocker.patch.object(Auths, "claims_authentication", return_value=User(id=1, email="test@test.com"))
+
+    async with database.async_session() as session:
+        account_repo = AccountRepository(session=session)
+        await account_repo.add_objects([Skill(id=1, name="Python"), Skill(id=2, name="PyTorch"), Skill(id=3, name="Go")])
+        await account_repo.add_user_skills(user_id=2, skill_ids=[2])
+        await session.commit()
+
+    response = await client.get(url="/account/skills/suggest", headers={"Authorization": "Bearer test"}, params={"q": "py"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == [{"id": 2, "name": "PyTorch"}, {"id": 1, "name": "Python"}]
+
+    response = await client.post(url="/account/skills", headers={"Authorization": "Bearer test"}, json=[{"name": "Pydantic"}])
+    assert response.status_code == status.HTTP_201_CREATED
+
+    response = await client.get(
+        url="/account/skills/suggest", headers={"Authorization": "Bearer test"}, params={"q": "PY", "limit": 1}
+    )
+
+    assert response.json() == [{"id": 4, "name": "Pydantic"}]
+
+    async with database.async_session() as session:
+        account_repo = AccountRepository(session=session)
+        await account_repo.delete_user_skill(user_id=2, skill_id=2)
+        await account_repo.delete_user_skill(user_id=1, skill_id=4)
+        await account_repo.delete_many(Skill, [1, 2, 3, 4])
+        await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_owner_scoped_update_and_delete(client: AsyncClient, mocker):
+    mocker.patch.object(Auths, "claims_authentication", return_value=User(id=1, email="test@test.com"))
+
+    async with database.async_session() as session:
+        session.add_all([
+            User(id=1, email="test@test.com", password="hashed", phone_number="010-1111-1111", membership_id=1),
+            User(id=2, email="other@test.com", password="hashed", phone_number="010-2222-2222", membership_id=1),
+            Country(id=1, name="Korea"),
+            Industry(id=1, name="Software"),
+            EnterpriseType(id=1, name="Startup"),
+            EmploymentType(id=1, name="Fulltime"),
+        ])
+        await session.flush()
+        session.add_all([
+            Enterprise(id=1, name="test_ent", description="test", enterprise_type_id=1, industry_id=1, country_id=1),
+            Profile(id=1, name="Mine", occupation="Dev", region="Seoul", country_id=1, user_id=1),
+            Profile(id=2, name="Theirs", country_id=1, user_id=2),
+        ])
+        await session.flush()
+        session.add_all([
+            Career(id=1, position="Intern", description="Mine", start_time=datetime.datetime(2020, 1, 1), enterprise_id=1, employment_type_id=1),
+            Career(id=2, position="Intern", description="Theirs", start_time=datetime.datetime(2020, 1, 1), enterprise_id=1, employment_type_id=1),
+        ])
+        await session.flush()
+        session.add_all([UserCareer(user_id=1, career_id=1), UserCareer(user_id=2, career_id=2)])
+        await session.commit()
+
+    response = await client.patch(
+        url="/account/profile",
+        headers={"Authorization": "Bearer test"},
+        json={"profile_id": 1, "occupation": "Lead"}
+    )
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.json()["data"] == {
+        "id": 1, "name": "Mine", "occupation": "Lead", "personal_description": None,
+        "region": "Seoul", "country_id": 1, "user_id": 1
+    }
+
+    response = await client.patch(
+        url="/account/profile",
+        headers={"Authorization": "Bearer test"},
+        json={"profile_id": 2, "occupation": "Lead"}
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    response = await client.patch(
+        url="/account/careers",
+        headers={"Authorization": "Bearer test"},
+        json={"id": 1, "position": "Senior"}
+    )
+
+    assert response.status_code == status.HTTP_201_CREATED
+
+    response = await client.patch(
+        url="/account/careers",
+        headers={"Authorization": "Bearer test"},
+        json={"id": 2, "position": "Senior"}
+    )
+
+    assert response.json() == {"detail": "Invalid Career id"}
+
+    response = await client.delete(url="/account/careers/2", headers={"Authorization": "Bearer test"})
+
+    assert response.json() == {"detail": "Invalid Career id"}
+
+    response = await client.delete(url="/account/profiles/2", headers={"Authorization": "Bearer test"})
+
+    assert response.json() == {"detail": "Invalid profile id"}
+
+    response = await client.delete(url="/account/careers/1", headers={"Authorization": "Bearer test"})
+
+    assert response.status_code == status.HTTP_200_OK
+
+    async with database.async_session() as session:
+        careers = {career.id: career for career in await session.scalars(select(Career))}
+        profiles = {profile.id: profile for profile in await session.scalars(select(Profile))}
+
+    assert list(careers) == [2]
+    assert careers[2].position == "Intern"
+    assert profiles[2].occupation is None
+    assert profiles[1].name == "Mine"
+
+    async with AsyncSession(async_engine) as session:
+        for model in [UserCareer, Career, Profile, User, Enterprise, EmploymentType, Country, Industry, EnterpriseType]:
+            await session.exec(delete(model))
+        await session.commit()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(("url", "field"), [
+    ("/account/educations", "major"),
+    ("/account/educations", "degree_type"),
+    ("/account/educations", "start_time"),
+    ("/account/educations", "enterprise_id"),
+    ("/account/careers", "position"),
+    ("/account/careers", "start_time"),
+    ("/account/careers", "enterprise_id"),
+    ("/account/careers", "employment_type_id"),
+    ("/account/profile", "country_id"),
+])
+async def test_update_rejects_null_for_required_columns(client: AsyncClient, mocker, url: str, field: str):
+    mocker.patch.object(Auths, "claims_authentication", return_value=User(id=1, email="test@test.com"))
+
+    response = await client.patch(url=url, headers={"Authorization": "Bearer test"}, json={"id": 1, "profile_id": 1, field: None})
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
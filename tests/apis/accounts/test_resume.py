@@ -0,0 +1,193 @@
+import asyncio
+import datetime
+
+import pytest
+from dateutil.relativedelta import relativedelta
+from fastapi import status
+from httpx import AsyncClient
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from src import config, database
+from src.database import get_async_db, get_session_factory
+from src.main import app
+from src.models.accounts import User
+from src.models.profile import Profile, Country, Skill, Career, Enterprise, EmploymentType, Education
+from src.models.repository import AccountRepository, token_version_cache
+from src.interfaces.permission import Auths
+from src.service.accounts import UserService
+from src.service.reference import ReferenceData
+
+
+@pytest.mark.asyncio
+async def test_resume_successfully(client: AsyncClient, mocker):
+    date = datetime.datetime.now().date()
+
+    test_user = User(
+        id=1,
+        email="test@test.com",
+        password="hashed",
+        nickname=None,
+        phone_number="010-1111-1111",
+        is_business=False,
+        is_admin=False,
+        created_at=datetime.datetime.now(),
+        membership_id=1,
+    )
+
+    mocker_user = mocker.patch.object(
+        Auths, "claims_authentication", return_value=test_user
+    )
+
+    mocker_profiles = mocker.patch.object(
+        AccountRepository, "get_profiles", return_value=[
+            Profile(
+                id=1,
+                name="test",
+                occupation="test",
+                personal_description="test",
+                region="test",
+                country_id=1,
+                user_id=1,
+                country=Country(id=1, name="South korea")
+            )
+        ]
+    )
+
+    mocker_countries = mocker.patch.object(
+        ReferenceData, "names", return_value={1: "South korea"}
+    )
+
+    mocker_skills = mocker.patch.object(
+        AccountRepository, "get_skills", return_value=[Skill(id=1, name="python")]
+    )
+
+    mocker_careers = mocker.patch.object(
+        AccountRepository, "get_careers", return_value=[
+            Career(
+                id=1,
+                position="Intern",
+                description="Lab Dog",
+                start_time=date - relativedelta(years=1),
+                end_time=None,
+                enterprise_id=1,
+                employment_type_id=1,
+                employment_type=EmploymentType(id=1, name="Intern"),
+                enterprise=Enterprise(id=1, name="test_ent")
+            )
+        ]
+    )
+
+    mocker_educations = mocker.patch.object(
+        AccountRepository, "get_educations", return_value=[
+            Education(
+                id=1,
+                major="Sociology",
+                description="Lab Dog",
+                start_time=date - relativedelta(years=3),
+                graduate_time=date,
+                grade="4.0",
+                degree_type="Bachelor",
+                enterprise=Enterprise(id=1, name="IOTS")
+            )
+        ]
+    )
+
+    response = await client.get(
+        url="/account/resume",
+        headers={"Authorization": "Bearer test"}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+
+    data = response.json()
+
+    assert data == {
+        "profiles": [
+            {
+                "id": 1,
+                "name": "test",
+                "occupation": "test",
+                "personal_description": "test",
+                "region": "test",
+                "country_name": "South korea"
+            }
+        ],
+        "skills": [
+            {
+                "id": 1,
+                "name": "python"
+            }
+        ],
+        "careers": [
+            {
+                "id": 1,
+                "position": "Intern",
+                "description": "Lab Dog",
+                "start_time": (date - relativedelta(years=1)).strftime("%Y-%m-%d"),
+                "end_time": None,
+                "employment_type_id": 1,
+                "employment_type_name": "Intern",
+                "enterprise_id": 1,
+                "enterprise_name": "test_ent"
+            }
+        ],
+        "educations": [
+            {
+                "id": 1,
+                "major": "Sociology",
+                "start_time": (date - relativedelta(years=3)).strftime("%Y-%m-%d"),
+                "graduate_time": date.strftime("%Y-%m-%d"),
+                "degree_type": "Bachelor",
+                "grade": "4.0",
+                "description": "Lab Dog",
+                "enterprise_id": 1,
+                "enterprise_name": "IOTS"
+            }
+        ]
+    }
+
+    timings = response.headers["Server-Timing"].split(", ")
+
+    assert [timing.split(";")[0] for timing in timings] == ["profiles", "skills", "careers", "educations"]
+    mocker_careers.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_resume_concurrent_requests_on_small_pool(client: AsyncClient, mocker):
+    # every request authenticates on its own connection before the fan-out needs more
+    engine = create_async_engine(
+        config.db.async_url, poolclass=AsyncAdaptedQueuePool, pool_size=2, max_overflow=0, pool_timeout=3
+    )
+    small_session = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False, autoflush=False)
+
+    async def small_db():
+        async with small_session() as session:
+            yield session
+
+    mocker.patch.object(config.db, "pool_size", 2)
+    app.dependency_overrides[get_async_db] = small_db
+    app.dependency_overrides[get_session_factory] = lambda: small_session
+    token_version_cache.clear()
+
+    users = [User(id=user_id, email=f"resume{user_id}@test.com", password="hashed", membership_id=1) for user_id in range(301, 305)]
+    async with database.async_session() as session:
+        session.add_all(users)
+        await session.commit()
+
+    try:
+        responses = await asyncio.gather(*[
+            client.get(url="/account/resume", headers={"Authorization": f"Bearer {UserService().create_jwt(user=user)}"})
+            for user in users
+        ])
+
+        assert [response.status_code for response in responses] == [status.HTTP_200_OK] * len(users)
+    finally:
+        app.dependency_overrides.clear()
+        await engine.dispose()
+
+        async with database.async_session() as session:
+            await session.execute(delete(User).where(User.id.in_([user.id for user in users])))
+            await session.commit()
@@ -0,0 +1,30 @@
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+from sqlalchemy import text
+
+from src import config
+from src.database import MonitoredAsyncPool, async_engine
+
+
+@pytest.mark.asyncio
+async def test_metrics_exposed(client: AsyncClient):
+    response = await client.get("/metrics")
+
+    assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(config.db.pool_class == "static", reason="the static pool exports no pool gauges")
+async def test_pool_metrics_exposed(client: AsyncClient):
+    assert isinstance(async_engine.pool, MonitoredAsyncPool)
+
+    async with async_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+        response = await client.get("/metrics")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert 'db_pool_checked_out{engine="primary"} 1.0' in response.text
+    assert 'db_pool_checkout_wait_seconds{engine="primary"}' in response.text
+    assert 'db_pool_overflow{engine="primary"} 0.0' in response.text
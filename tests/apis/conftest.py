@@ -1,9 +1,35 @@
+import pytest
 import pytest_asyncio
 from httpx import AsyncClient
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from src import config
 from src.database import async_engine, close_db, create_db_and_tables
 from src.main import app
+from src.models.repository import post_cache
+from src.service.reference import reference_data
+from src.service.suggest import suggest_indexes
+
+
+@pytest.fixture(autouse=True)
+def raise_on_lazy_load(monkeypatch):
+    monkeypatch.setattr(config.db, "raise_on_lazy_load", True)
+
+
+@pytest.fixture(autouse=True)
+def clear_reference_data():
+    reference_data.clear()
+    suggest_indexes.clear()
+    yield
+    reference_data.clear()
+    suggest_indexes.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_post_cache():
+    post_cache.clear()
+    yield
+    post_cache.clear()
 
 
 @pytest_asyncio.fixture(scope="function")
@@ -0,0 +1,139 @@
+import asyncio
+import datetime
+
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+from sqlalchemy import delete
+
+from src import database
+from src.interfaces.pagination import NEXT_CURSOR_HEADER, encode_cursor
+from src.interfaces.permission import Auths
+from src.models.accounts import User
+from src.models.post import Post
+from src.models.repository import PostRepository, post_cache
+
+
+@pytest.mark.asyncio
+async def test_create_and_get_post_successfully(client: AsyncClient, mocker):
+    response = await client.post(url="/posts", json={"title": "hello", "content": "world"})
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    mocker.patch.object(Auths, "claims_authentication", return_value=User(id=7, email="test@test.com"))
+    # an author in the body is ignored, it comes from the token
+    response = await client.post(
+        url="/posts", headers={"Authorization": "Bearer test"}, json={"title": "hello", "content": "world", "user_id": 1}
+    )
+
+    assert response.status_code == status.HTTP_201_CREATED
+
+    created = response.json()
+    response = await client.get(url=f"/posts/{created['id']}")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["title"] == "hello"
+
+    async with database.async_session() as session:
+        assert (await session.get(Post, created["id"])).user_id == 7
+
+    response = await client.get(url="/posts/999")
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    async with database.async_session() as session:
+        await session.execute(delete(Post))
+        await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_post_feed_keyset_pagination(client: AsyncClient):
+    created_at = datetime.datetime(2024, 1, 1)
+
+    async with database.async_session() as session:
+        # ids 3 and 4 share a timestamp, the id tie-break keeps them on separate pages without skipping
+        session.add_all([
+            Post(id=1, user_id=1, title="first", content="", created_at=created_at),
+            Post(id=2, user_id=1, title="second", content="", created_at=created_at + datetime.timedelta(minutes=1)),
+            Post(id=3, user_id=1, title="third", content="", created_at=created_at + datetime.timedelta(minutes=2)),
+            Post(id=4, user_id=1, title="fourth", content="", created_at=created_at + datetime.timedelta(minutes=2)),
+            Post(id=5, user_id=1, title="fifth", content="", created_at=created_at + datetime.timedelta(minutes=3)),
+        ])
+        await session.commit()
+
+    pages = []
+    params = {"limit": 2}
+    while True:
+        response = await client.get(url="/posts", params=params)
+        assert response.status_code == status.HTTP_200_OK
+        pages.append([post["id"] for post in response.json()])
+
+        if NEXT_CURSOR_HEADER not in response.headers:
+            break
+        params["after"] = response.headers[NEXT_CURSOR_HEADER]
+
+    assert pages == [[5, 4], [3, 2], [1]]
+
+    response = await client.get(url="/posts", params=[("ids", 4), ("ids", 1), ("ids", 999), ("ids", 4)])
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [post["id"] for post in response.json()] == [4, 1]
+
+    response = await client.get(url="/posts", params={"after": encode_cursor(5)})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    response = await client.get(url="/posts", params={"after": encode_cursor("yesterday", 5)})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    async with database.async_session() as session:
+        await session.execute(delete(Post))
+        await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_post_read_cache(client: AsyncClient, mocker):
+    async with database.async_session() as session:
+        session.add(Post(id=1, user_id=1, title="viral", content="post", created_at=datetime.datetime(2024, 1, 1)))
+        await session.commit()
+
+    load = PostRepository._load_post_body
+
+    async def slow_load(self, post_id, response_model):
+        # keeps the first fetch in flight while the other requests miss
+        await asyncio.sleep(0.05)
+        return await load(self, post_id, response_model)
+
+    loader = mocker.patch.object(PostRepository, "_load_post_body", autospec=True, side_effect=slow_load)
+
+    responses = await asyncio.gather(*[client.get(url="/posts/1") for _ in range(20)])
+
+    assert {response.status_code for response in responses} == {status.HTTP_200_OK}
+    assert {response.content for response in responses} == {responses[0].content}
+    assert responses[0].json()["title"] == "viral"
+    assert loader.call_count == 1
+
+    response = await client.get(url="/posts/1")
+
+    assert response.json()["title"] == "viral"
+    assert loader.call_count == 1
+
+    # writes through the repository drop the cached body
+    async with database.async_session() as session:
+        assert await PostRepository(session).update_owned(Post, 1, Post.title == "viral", {"title": "edited"})
+        assert post_cache.get(1) is None
+        await session.commit()
+
+    response = await client.get(url="/posts/1")
+
+    assert response.json() == {"id": 1, "title": "edited", "content": "post", "created_at": "2024-01-01T00:00:00"}
+    assert loader.call_count == 2
+
+    async with database.async_session() as session:
+        assert await PostRepository(session).delete_many(Post, [1]) == 1
+        await session.commit()
+
+    response = await client.get(url="/posts/1")
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,116 @@
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+from sqlalchemy import delete, update
+from sqlalchemy.exc import DBAPIError
+
+from src import database
+from src.interfaces.pagination import NEXT_CURSOR_HEADER
+from src.models.accounts import User
+from src.models.post import Post
+from src.models.profile import Country, Enterprise, EnterpriseType, Industry
+from src.models.search import DUPLICATE_KEY_NAME, SEARCH_COLUMNS, _create_fulltext_index
+from src.interfaces.permission import Auths
+
+
+@pytest.mark.asyncio
+async def test_search_posts_ranked_and_paginated(client: AsyncClient, mocker):
+    mocker.patch.object(Auths, "claims_authentication", return_value=User(id=1, email="test@test.com"))
+
+    async with database.async_session() as session:
+        session.add_all([
+            Post(id=1, user_id=1, title="python", content="python python fastapi"),
+            Post(id=2, user_id=1, title="hiring", content="python backend"),
+            Post(id=3, user_id=1, title="java", content="spring"),
+            Post(id=4, user_id=1, title="python tips", content="python"),
+        ])
+        await session.commit()
+
+    pages = []
+    params = {"q": "python", "type": "post", "limit": 2}
+    while True:
+        response = await client.get(url="/search", headers={"Authorization": "Bearer test"}, params=params)
+        assert response.status_code == status.HTTP_200_OK
+        pages.append(response.json())
+
+        if NEXT_CURSOR_HEADER not in response.headers:
+            break
+        params["after"] = response.headers[NEXT_CURSOR_HEADER]
+
+    hits = [post for page in pages for post in page]
+
+    assert [len(page) for page in pages] == [2, 1]
+    assert sorted(post["id"] for post in hits) == [1, 2, 4]
+    # most relevant first, the score itself only orders the keyset and stays out of the response
+    assert [post["id"] for post in hits] == [1, 4, 2]
+    assert all("score" not in post for post in hits)
+
+    response = await client.get(
+        url="/search", headers={"Authorization": "Bearer test"}, params={"q": "python AND (spring", "type": "post"}
+    )
+
+    assert response.json() == []
+
+    async with database.async_session() as session:
+        # the index follows updates and deletes made by any statement
+        await session.execute(update(Post).where(Post.id == 3).values(content="python spring"))
+        await session.execute(delete(Post).where(Post.id == 1))
+        await session.commit()
+
+    response = await client.get(
+        url="/search", headers={"Authorization": "Bearer test"}, params={"q": "Python", "type": "post"}
+    )
+
+    assert sorted(post["id"] for post in response.json()) == [2, 3, 4]
+
+    async with database.async_session() as session:
+        await session.execute(delete(Post))
+        await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_search_enterprises(client: AsyncClient, mocker):
+    mocker.patch.object(Auths, "claims_authentication", return_value=User(id=1, email="test@test.com"))
+
+    async with database.async_session() as session:
+        session.add_all([Country(id=1, name="Korea"), Industry(id=1, name="Software"), EnterpriseType(id=1, name="Startup")])
+        await session.flush()
+        session.add_all([
+            Enterprise(id=1, name="Lab", description="search engine", enterprise_type_id=1, industry_id=1, country_id=1),
+            Enterprise(id=2, name="Shop", description="online store", enterprise_type_id=1, industry_id=1, country_id=1),
+        ])
+        await session.commit()
+
+    response = await client.get(
+        url="/search", headers={"Authorization": "Bearer test"}, params={"q": "search engine", "type": "enterprise"}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [(enterprise["id"], enterprise["name"]) for enterprise in response.json()] == [(1, "Lab")]
+
+    response = await client.get(
+        url="/search", headers={"Authorization": "Bearer test"}, params={"q": "store", "type": "profile"}
+    )
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    async with database.async_session() as session:
+        for model in [Enterprise, Country, Industry, EnterpriseType]:
+            await session.execute(delete(model))
+        await session.commit()
+
+
+@pytest.mark.parametrize("code, raises", [(DUPLICATE_KEY_NAME, False), (1205, True)])
+def test_fulltext_index_tolerates_a_concurrent_run(mocker, code, raises):
+    # another run adds the index between the existence check and the ALTER
+    connection = mocker.Mock()
+    connection.execute.side_effect = [
+        mocker.Mock(first=mocker.Mock(return_value=None)),
+        DBAPIError("ALTER TABLE", None, Exception(code, "error")),
+    ]
+
+    if raises:
+        with pytest.raises(DBAPIError):
+            _create_fulltext_index(connection, Post, SEARCH_COLUMNS[Post])
+    else:
+        _create_fulltext_index(connection, Post, SEARCH_COLUMNS[Post])
@@ -0,0 +1,128 @@
+import pytest
+from fastapi import HTTPException, Response
+from httpx import AsyncClient
+from sqlalchemy import event
+from sqlalchemy.exc import InvalidRequestError
+from sqlmodel import select
+from starlette.requests import Request
+
+from src import database
+from src.database import get_async_db
+from src.models.profile import Country, Profile
+from src.models.accounts import User
+from src.models.repository import AccountRepository
+
+
+def make_request(method: str) -> Request:
+    return Request(scope={"type": "http", "method": method, "headers": []})
+
+
+async def count_countries(name: str) -> int:
+    async with database.async_session() as session:
+        return len(list(await session.scalars(select(Country).where(Country.name == name))))
+
+
+@pytest.mark.asyncio
+async def test_unit_of_work_commits_once(client: AsyncClient, mocker):
+    commit = mocker.spy(database.AsyncSession, "commit")
+    dependency = get_async_db(request=make_request("POST"), response=Response())
+    session = await anext(dependency)
+
+    account_repo = AccountRepository(session=session)
+    await account_repo.add_object(Country(id=100, name="UnitOfWork"))
+    await account_repo.add_objects([Country(id=101, name="UnitOfWork")])
+
+    assert commit.call_count == 0
+
+    with pytest.raises(StopAsyncIteration):
+        await anext(dependency)
+
+    assert commit.call_count == 1
+    assert await count_countries("UnitOfWork") == 2
+
+    async with database.async_session() as session:
+        await AccountRepository(session=session).delete_many(Country, [100, 101])
+        await session.commit()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("executemany_returning", [True, False])
+async def test_add_objects_sends_one_insert(client: AsyncClient, monkeypatch, executemany_returning: bool):
+    # False takes the path of backends without RETURNING
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    async with database.async_session() as session:
+        monkeypatch.setattr(session.get_bind().dialect, "insert_executemany_returning", executemany_returning)
+        event.listen(database.async_engine.sync_engine, "before_cursor_execute", record)
+        try:
+            countries = await AccountRepository(session=session).add_objects(
+                [Country(id=country_id, name="Batch") for country_id in range(110, 113)]
+            )
+        finally:
+            event.remove(database.async_engine.sync_engine, "before_cursor_execute", record)
+
+        assert [statement.split()[0] for statement in statements] == ["INSERT"]
+        assert all(country in session for country in countries)
+        await session.commit()
+
+    assert await count_countries("Batch") == 3
+
+    async with database.async_session() as session:
+        await AccountRepository(session=session).delete_many(Country, [110, 111, 112])
+        await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_unit_of_work_rolls_back_on_exception(client: AsyncClient):
+    dependency = get_async_db(request=make_request("POST"), response=Response())
+    session = await anext(dependency)
+
+    await AccountRepository(session=session).add_object(Country(id=102, name="RolledBack"))
+
+    with pytest.raises(HTTPException):
+        await dependency.athrow(HTTPException(status_code=400))
+
+    assert await count_countries("RolledBack") == 0
+
+
+@pytest.mark.asyncio
+async def test_unit_of_work_skips_commit_for_reads(client: AsyncClient, mocker):
+    commit = mocker.spy(database.AsyncSession, "commit")
+    dependency = get_async_db(request=make_request("GET"), response=Response())
+    session = await anext(dependency)
+
+    await AccountRepository(session=session).get_all_obj(Country)
+
+    with pytest.raises(StopAsyncIteration):
+        await anext(dependency)
+
+    commit.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_implicit_lazy_load_raises(client: AsyncClient):
+    async with database.async_session() as session:
+        session.add_all([
+            Country(id=103, name="LazyLoad"),
+            User(id=103, email="lazy@test.com", password="hashed", membership_id=1),
+            Profile(id=103, name="lazy", country_id=103, user_id=103),
+        ])
+        await session.commit()
+
+    async with database.async_session() as session:
+        account_repo = AccountRepository(session=session)
+
+        profile = await account_repo.get_obj_by_id(Profile, 103)
+        with pytest.raises(InvalidRequestError, match="lazy='raise_on_sql'"):
+            profile.country
+
+        profile = await account_repo.get_obj_by_id(Profile, 103, relation="country")
+        assert profile.country.name == "LazyLoad"
+
+        await account_repo.delete_many(Profile, [103])
+        await account_repo.delete_many(User, [103])
+        await account_repo.delete_many(Country, [103])
+        await session.commit()
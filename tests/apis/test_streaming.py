@@ -0,0 +1,115 @@
+import asyncio
+import json
+import tracemalloc
+
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+from sqlalchemy import text
+
+from src import config, database
+from src.interfaces.permission import Auths
+from src.interfaces.streaming import NDJSON_MEDIA_TYPE
+from src.main import app
+from src.models.accounts import User
+from src.models.profile import Country, Skill
+from src.models.repository import AccountRepository
+from src.service.reference import reference_data
+
+
+async def seed(table: str, rows: int) -> None:
+    async with database.async_engine.begin() as conn:
+        await conn.execute(text(
+            "WITH RECURSIVE seq(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM seq WHERE n < :rows) "
+            f"INSERT INTO {table} (id, name) SELECT n, '{table}' || n FROM seq"
+        ), {"rows": rows})
+
+
+async def clear(table: str) -> None:
+    async with database.async_engine.begin() as conn:
+        await conn.execute(text(f"DELETE FROM {table}"))
+
+
+async def export_peak(path: str, model, rows: int) -> tuple[int, int, int]:
+    # runs the endpoint through the ASGI app and drops every chunk,
+    # returns (lines, lines in the largest chunk, peak bytes allocated while answering)
+    await seed(model.__tablename__, rows)
+    async with database.async_session() as session:
+        # the table is cached for the worker's lifetime, only what the response adds on top of it counts
+        await reference_data.get(model, session)
+
+    lines = largest = 0
+    requested = asyncio.Event()
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+        "path": path, "raw_path": path.encode(), "query_string": b"", "root_path": "",
+        "headers": [(b"host", b"test"), (b"authorization", b"Bearer test"), (b"accept", NDJSON_MEDIA_TYPE.encode())],
+        "client": ("127.0.0.1", 1), "server": ("test", 80),
+    }
+
+    async def receive():
+        if not requested.is_set():
+            requested.set()
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # the client stays connected until the body is done
+        await asyncio.Future()
+
+    async def send(message):
+        nonlocal lines, largest
+        if message["type"] == "http.response.start":
+            assert message["status"] == status.HTTP_200_OK
+        elif message["type"] == "http.response.body":
+            count = message.get("body", b"").count(b"\n")
+            lines, largest = lines + count, max(largest, count)
+
+    tracemalloc.start()
+    try:
+        await app(scope, receive, send)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    reference_data.clear()
+    await clear(model.__tablename__)
+
+    return lines, largest, peak
+
+
+@pytest.mark.asyncio
+async def test_country_list_streams_ndjson(client: AsyncClient, mocker):
+    mocker.patch.object(Auths, "claims_authentication", return_value=User(id=1, email="test@test.com"))
+    await seed("country", 3)
+
+    response = await client.get(
+        url="/account/countries",
+        headers={"Authorization": "Bearer test", "Accept": NDJSON_MEDIA_TYPE},
+        params={"limit": 1},
+    )
+
+    async with database.async_session() as session:
+        countries = [country.name async for country in AccountRepository(session=session).stream_all_obj(Country)]
+
+    await clear("country")
+
+    assert countries == ["country1", "country2", "country3"]
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == NDJSON_MEDIA_TYPE
+    assert [json.loads(line) for line in response.text.splitlines()] == [
+        {"id": 1, "name": "country1"},
+        {"id": 2, "name": "country2"},
+        {"id": 3, "name": "country3"},
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(("path", "model"), [("/account/countries", Country), ("/account/skills", Skill)])
+async def test_ndjson_export_memory_is_flat(client: AsyncClient, mocker, path: str, model):
+    mocker.patch.object(Auths, "claims_authentication", return_value=User(id=1, email="test@test.com"))
+
+    small_lines, _, small_peak = await export_peak(path, model, 10_000)
+    large_lines, largest, large_peak = await export_peak(path, model, 1_000_000)
+
+    assert (small_lines, large_lines) == (10_000, 1_000_000)
+    assert largest <= config.pagination.stream_batch_size
+    # 100x the rows must not mean more than a batch worth of extra memory
+    assert large_peak < small_peak * 2
@@ -0,0 +1,107 @@
+import asyncio
+import datetime
+import threading
+
+import pytest
+from fastapi import HTTPException
+from freezegun import freeze_time
+from jose import jwt
+
+from src.models.accounts import User
+from src.service.accounts import UserService
+from src.service.executor import BoundedExecutor
+
+
+@pytest.mark.asyncio
+async def test_async_password_round_trip():
+    user_service = UserService()
+
+    hashed_password = await user_service.async_hash_password(plain_password="Plain123!")
+
+    assert await user_service.async_verify_password(plain_password="Plain123!", hashed_password=hashed_password)
+    assert not await user_service.async_verify_password(plain_password="Wrong123!", hashed_password=hashed_password)
+
+
+@pytest.mark.asyncio
+async def test_bounded_executor_sheds_load_when_saturated():
+    executor = BoundedExecutor(name="test", max_workers=1, max_queue=1)
+    release = threading.Event()
+
+    running = asyncio.ensure_future(executor.run(release.wait))
+    queued = asyncio.ensure_future(executor.run(release.wait))
+    await asyncio.sleep(0)
+
+    with pytest.raises(HTTPException) as exc:
+        await executor.run(release.wait)
+
+    assert exc.value.status_code == 503
+    assert executor.pending == 2
+
+    release.set()
+    await asyncio.gather(running, queued)
+
+    assert executor.pending == 0
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_bounded_executor_counts_work_of_cancelled_callers():
+    executor = BoundedExecutor(name="test", max_workers=1, max_queue=1)
+    release = threading.Event()
+
+    running = asyncio.ensure_future(executor.run(release.wait))
+    await asyncio.sleep(0)
+    running.cancel()
+
+    # the caller is gone but its call still occupies the worker
+    with pytest.raises(asyncio.CancelledError):
+        await running
+
+    assert executor.pending == 1
+
+    queued = asyncio.ensure_future(executor.run(release.wait))
+    await asyncio.sleep(0)
+
+    with pytest.raises(HTTPException):
+        await executor.run(release.wait)
+
+    release.set()
+    await queued
+    await asyncio.sleep(0.01)
+
+    assert executor.pending == 0
+    executor.shutdown()
+
+
+def test_decode_claims_memoizes_verified_token(mocker):
+    token = UserService().create_jwt(user=User(id=1, email="memo@test.com", membership_id=1))
+    verify = mocker.spy(jwt, "decode")
+
+    first = UserService().decode_claims(access_token=token)
+    second = UserService().decode_claims(access_token=token)
+
+    assert first == second
+    assert first.sub == "memo@test.com"
+    assert verify.call_count == 1
+
+
+def test_decode_claims_never_serves_expired_token():
+    token = UserService().create_jwt(user=User(id=1, email="expired@test.com", membership_id=1))
+
+    UserService().decode_claims(access_token=token)
+
+    with freeze_time(datetime.datetime.now() + datetime.timedelta(days=8)):
+        with pytest.raises(HTTPException) as exc:
+            UserService().decode_claims(access_token=token)
+
+    assert exc.value.detail == "Token expired"
+
+
+def test_decode_claims_does_not_cache_invalid_token():
+    token = UserService().create_jwt(user=User(id=1, email="invalid@test.com", membership_id=1))
+
+    for _ in range(2):
+        with pytest.raises(HTTPException) as exc:
+            UserService().decode_claims(access_token=token[:-2])
+
+        assert exc.value.detail == "Invalid token"
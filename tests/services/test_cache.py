@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+
+from src.cache import TTLCache
+
+
+def test_cache_evicts_least_recently_used():
+    cache = TTLCache(name="test", maxsize=2, ttl=60)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_cache_expires_entries():
+    cache = TTLCache(name="test", maxsize=2, ttl=60)
+
+    cache.set("a", 1, ttl=0)
+
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_cache_collapses_concurrent_loads():
+    cache = TTLCache(name="test", maxsize=2, ttl=60)
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "value"
+
+    results = await asyncio.gather(*[cache.get_or_load("a", loader) for _ in range(10)])
+
+    assert results == ["value"] * 10
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_drops_loads_invalidated_in_flight():
+    cache = TTLCache(name="test", maxsize=2, ttl=60)
+    values = iter(["old", "new"])
+
+    async def loader():
+        value = next(values)
+        await asyncio.sleep(0.01)
+        return value
+
+    stale = asyncio.create_task(cache.get_or_load("a", loader))
+    await asyncio.sleep(0)
+    cache.invalidate("a")
+
+    assert await stale == "old"
+    assert cache.get("a") is None
+    assert await cache.get_or_load("a", loader) == "new"
+    assert cache.get("a") == "new"
+
+
+@pytest.mark.asyncio
+async def test_cache_followers_retry_after_cancelled_leader():
+    cache = TTLCache(name="test", maxsize=2, ttl=60)
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "value"
+
+    leader = asyncio.create_task(cache.get_or_load("a", loader))
+    await asyncio.sleep(0)
+    followers = [asyncio.create_task(cache.get_or_load("a", loader)) for _ in range(5)]
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await asyncio.gather(*followers) == ["value"] * 5
+    assert len(calls) == 2
+    assert leader.cancelled()
@@ -0,0 +1,47 @@
+import json
+
+from src.models.profile import Country, Skill
+from src.service.reference import ReferenceTable
+
+
+def test_reference_table_pages_encoded_rows():
+    table = ReferenceTable([Country(id=country_id, name=f"country{country_id}") for country_id in [1, 2, 4]])
+
+    assert table.page(after_id=None, limit=10) == (table.body, None)
+    assert json.loads(table.body) == [
+        {"id": 1, "name": "country1"}, {"id": 2, "name": "country2"}, {"id": 4, "name": "country4"}
+    ]
+
+    content, last_id = table.page(after_id=None, limit=2)
+    assert (json.loads(content), last_id) == ([{"id": 1, "name": "country1"}, {"id": 2, "name": "country2"}], 2)
+
+    content, last_id = table.page(after_id=2, limit=2)
+    assert (json.loads(content), last_id) == ([{"id": 4, "name": "country4"}], None)
+
+    assert list(table.ndjson(after_id=1, batch_size=10)) == [b'{"id":2,"name":"country2"}\n{"id":4,"name":"country4"}\n']
+    assert table.names == {1: "country1", 2: "country2", 4: "country4"}
+
+
+def test_reference_table_streams_ndjson_in_batches():
+    table = ReferenceTable([Country(id=country_id, name=f"country{country_id}") for country_id in [1, 2, 4]])
+    batches = table.ndjson(after_id=None, batch_size=2)
+
+    assert next(batches) == b'{"id":1,"name":"country1"}\n{"id":2,"name":"country2"}\n'
+    # a row added while streaming doesn't repeat or skip the rows around it
+    table.add([Country(id=0, name="country0"), Country(id=3, name="country3")])
+    assert list(batches) == [b'{"id":3,"name":"country3"}\n{"id":4,"name":"country4"}\n']
+
+
+def test_reference_table_adds_rows_in_place():
+    table = ReferenceTable([Skill(id=skill_id, name=f"skill{skill_id}") for skill_id in [1, 4]])
+    version = table.version
+
+    table.add([Skill(id=2, name="Python"), Skill(id=4, name="Go Lang")])
+
+    assert table.ids == [1, 2, 4]
+    assert json.loads(table.body) == [
+        {"id": 1, "name": "skill1"}, {"id": 2, "name": "Python"}, {"id": 4, "name": "Go Lang"}
+    ]
+    assert table.ids_by_name == {"skill1": 1, "python": 2, "go lang": 4}
+    assert table.names[4] == "Go Lang"
+    assert table.version != version
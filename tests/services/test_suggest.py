@@ -0,0 +1,61 @@
+from src.service import suggest
+from src.service.suggest import PrefixIndex
+
+
+def names(suggestions: list[dict]) -> list[str]:
+    return [suggestion["name"] for suggestion in suggestions]
+
+
+def test_prefix_index_ranks_by_popularity():
+    index = PrefixIndex("test")
+    index.build([(1, "Python"), (2, "PyTorch"), (3, "Go"), (4, "pandas")], {2: 5, 4: 1})
+
+    assert names(index.suggest("py", 10)) == ["PyTorch", "Python"]
+    assert names(index.suggest(" P", 10)) == ["PyTorch", "pandas", "Python"]
+    assert names(index.suggest("", 2)) == ["PyTorch", "pandas"]
+    assert index.suggest("rust", 10) == []
+
+
+def test_prefix_index_updates_incrementally(monkeypatch):
+    monkeypatch.setattr(suggest, "MEMO_THRESHOLD", 0)
+    index = PrefixIndex("test")
+    index.build([(1, "Python"), (2, "PyTorch")], {1: 1})
+
+    assert names(index.suggest("py", 10)) == ["Python", "PyTorch"]
+
+    index.add(3, "Pydantic")
+    index.bump(3, 2)
+    assert names(index.suggest("py", 10)) == ["Pydantic", "Python", "PyTorch"]
+
+    index.bump(3, -2)
+    assert names(index.suggest("py", 10)) == ["Python", "Pydantic", "PyTorch"]
+    assert len(index) == 3
+
+
+def test_prefix_index_pins_short_prefixes():
+    index = PrefixIndex("test")
+    index.build([(1, "Python"), (2, "PyTorch"), (3, "Go"), (4, "pandas"), (5, "P")], {2: 5, 4: 1})
+
+    assert {"", "p", "py", "g", "go", "pa"} <= index._top.keys()
+    assert names(index.suggest("p", 10)) == ["PyTorch", "pandas", "P", "Python"]
+
+    # a decrement reorders a pinned list instead of dropping it
+    index.bump(2, -5)
+    assert "py" in index._top
+    assert names(index.suggest("py", 10)) == ["Python", "PyTorch"]
+
+
+def test_prefix_index_replays_writes_made_during_rebuild():
+    index = PrefixIndex("test")
+    index.build([(1, "Python")], {})
+
+    index.begin_rebuild()
+    arrays = suggest.build_arrays([(1, "Python"), (2, "PyTorch")], {}, 10)
+    index.add(3, "Pydantic")
+    index.bump(3, 4)
+    index.swap(arrays, {})
+
+    assert names(index.suggest("py", 10)) == ["Pydantic", "Python", "PyTorch"]
+
+    index.add(4, "Pyo")
+    assert index._journal is None